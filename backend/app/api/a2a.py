@@ -6,236 +6,320 @@ Protocol: JSON-RPC 2.0 over HTTPS
 Spec ref: https://a2a-protocol.org/latest/specification/ (Section 9)
 """
 
+import functools
 import json
+import os
 import re
-import uuid
+import time
+from collections.abc import Callable, Iterable
 from datetime import datetime, timezone
 
+import orjson
+from cachetools import TTLCache
 from fastapi import APIRouter, Request
+from fastapi.responses import ORJSONResponse
 
-from app.models.a2a_schemas import (
-    A2ATaskState,
-    A2AMessageRole,
-    A2APart,
-    A2AMessage,
-    A2ATaskStatus,
-    A2AArtifact,
-    A2ATask,
-    SendMessageResponse,
-    JSONRPCRequest,
-    JSONRPCResponse,
-)
-from app.services.agents import get_a2a_trust, route_agents, compare_agents
+from app.models.a2a_schemas import A2ATaskState, A2AMessageRole
+from app.services.agents import get_a2a_trust, route_agents, compare_agents, trust_cache
 
 a2a_router = APIRouter(tags=["A2A Protocol"])
 
-_task_store: dict[str, dict] = {}
+JSONRPCId = str | int | None
+
+# GetTask only needs recent tasks; bound the store so SendMessage traffic
+# cannot grow it without limit. Expiry is lazy, on access. Tasks are kept as
+# orjson-encoded bytes and spliced into responses as orjson.Fragment.
+_TASK_STORE_MAXSIZE = 10_000
+_TASK_STORE_TTL = 3600
+_task_store: TTLCache = TTLCache(maxsize=_TASK_STORE_MAXSIZE, ttl=_TASK_STORE_TTL)
+
+# Route recommendations depend only on the category, not on the message text,
+# so they are shared across requests for a short window.
+_ROUTE_CACHE_TTL = 30.0
+_route_cache: dict[str, tuple[float, dict]] = {}
+
+_HEX_DELETE = str.maketrans("", "", "0123456789abcdefABCDEF")
+# Applied to already-lowercased text, so no IGNORECASE folding in the engine.
+_DID_RE = re.compile(r"did:garl:([0-9a-f-]{36})")
+
+
+_ID_BATCH = 256
+_id_batch: list[str] = []
+
+
+def _new_id() -> str:
+    """Random 128-bit hex ID for tasks, contexts, artifacts and messages.
+
+    IDs are sliced from one os.urandom() call per batch instead of building a
+    UUID object per ID. list.pop/extend are atomic under the GIL.
+    """
+    try:
+        return _id_batch.pop()
+    except IndexError:
+        raw = os.urandom(16 * _ID_BATCH).hex()
+        _id_batch.extend(raw[i:i + 32] for i in range(0, len(raw), 32))
+        return _id_batch.pop()
 
 
 def _now_iso() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    dt = datetime.now(timezone.utc)
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+        f"T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}.000Z"
+    )
+
+
+def _jsonrpc_envelope(req_id: JSONRPCId, key: str, value: dict | orjson.Fragment) -> dict:
+    """JSON-RPC response dict shaped like JSONRPCResponse.model_dump(exclude_none=True)."""
+    envelope: dict = {"jsonrpc": "2.0", key: value}
+    if req_id is not None:
+        envelope["id"] = req_id
+    return envelope
 
 
-def _jsonrpc_error(req_id, code: int, message: str, data: dict | None = None) -> dict:
+def _jsonrpc_error(req_id: JSONRPCId, code: int, message: str, data: dict | None = None) -> dict:
     err: dict = {"code": code, "message": message}
     if data:
         err["data"] = data
-    return JSONRPCResponse(jsonrpc="2.0", error=err, id=req_id).model_dump(exclude_none=True)
+    return _jsonrpc_envelope(req_id, "error", err)
+
+
+def _jsonrpc_result(req_id: JSONRPCId, result: dict | orjson.Fragment) -> dict:
+    return _jsonrpc_envelope(req_id, "result", result)
+
+
+def _find_uuids(text: str, limit: int = 0) -> list[str]:
+    """Scan text for 8-4-4-4-12 hex UUIDs, left to right, without overlap.
+
+    Jumps between '-' characters with str.find and validates each 36-char
+    window in place, so no regex machinery runs on the request path.
+    """
+    found: list[str] = []
+    n = len(text)
+    start = 0
+    dash = text.find("-", 8)
+    while dash != -1 and dash + 28 <= n:
+        i = dash - 8
+        if i >= start:
+            candidate = text[i:i + 36]
+            if (
+                candidate[13] == "-"
+                and candidate[18] == "-"
+                and candidate[23] == "-"
+                and candidate.translate(_HEX_DELETE) == "----"
+            ):
+                found.append(candidate)
+                if len(found) == limit:
+                    break
+                start = i + 36
+                dash = text.find("-", start + 8)
+                continue
+        dash = text.find("-", dash + 1)
+    return found
 
 
 def _extract_agent_id(text: str) -> str | None:
-    """Extract UUID from free-form text."""
-    match = re.search(
-        r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
-        text,
-        re.IGNORECASE,
-    )
-    return match.group(0) if match else None
+    """Extract UUID from lowercased free-form text."""
+    ids = _find_uuids(text, limit=1)
+    return ids[0] if ids else None
 
 
 def _extract_did(text: str) -> str | None:
-    """Extract did:garl:UUID from text."""
-    match = re.search(r"did:garl:([0-9a-f-]{36})", text, re.IGNORECASE)
+    """Extract did:garl:UUID from lowercased text."""
+    match = _DID_RE.search(text)
     return match.group(1) if match else None
 
 
-def _detect_intent(text: str) -> tuple[str, dict]:
-    """Detect which GARL skill to invoke from free-form text."""
+_INTENT_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "route_agent": ("route", "find agent", "recommend", "best agent", "delegate"),
+    "compare_agents": ("compare", "versus", "vs", "side by side"),
+    "register_agent": ("register", "sign up", "create agent", "onboard"),
+}
+_ROUTE_CATEGORIES = ("coding", "research", "data", "automation", "sales")
+
+_KEYWORD_INTENT: dict[str, str] = {
+    kw: intent for intent, keywords in _INTENT_KEYWORDS.items() for kw in keywords
+}
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Compile words into a prefix-trie regex, e.g. re(?:cord|port)."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def _walk(node: dict) -> str:
+        branches = [re.escape(ch) + _walk(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return _walk(trie)
+
+
+# Zero-width lookahead so every start offset is tried: one pass reports the
+# same hits as a separate `kw in text` check per keyword.
+_KEYWORD_SCAN_RE = re.compile(
+    "(?=(" + _trie_pattern([*_KEYWORD_INTENT, *_ROUTE_CATEGORIES]) + "))"
+)
+
+
+def _scan_keywords(lower: str) -> set[str]:
+    """Return every intent/category keyword present in lowercased text."""
+    return {m.group(1) for m in _KEYWORD_SCAN_RE.finditer(lower)}
+
+
+@functools.lru_cache(maxsize=512)
+def _detect_intent(text: str) -> tuple[str, tuple[tuple[str, object], ...]]:
+    """Detect which GARL skill to invoke from free-form text.
+
+    Params are returned as a tuple of (key, value) pairs so the result can be
+    cached and shared between requests; callers rebuild a dict from it.
+    """
+    # str.lower() takes CPython's ASCII fast path; it measures faster than an
+    # ASCII str.translate table or an IGNORECASE scan, so lower once and scan.
     lower = text.lower()
+    hits = _scan_keywords(lower)
+    intents = {_KEYWORD_INTENT[kw] for kw in hits if kw in _KEYWORD_INTENT}
 
-    agent_id = _extract_did(text) or _extract_agent_id(text)
-
-    if any(kw in lower for kw in ["route", "find agent", "recommend", "best agent", "delegate"]):
-        category = "other"
-        for cat in ["coding", "research", "data", "automation", "sales"]:
-            if cat in lower:
-                category = cat
-                break
-        return "route_agent", {"category": category}
-
-    if any(kw in lower for kw in ["compare", "versus", "vs", "side by side"]):
-        ids = re.findall(
-            r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
-            text,
-            re.IGNORECASE,
-        )
-        return "compare_agents", {"agent_ids": ids}
+    if "route_agent" in intents:
+        category = next((cat for cat in _ROUTE_CATEGORIES if cat in hits), "other")
+        return "route_agent", (("category", category),)
+
+    if "compare_agents" in intents:
+        return "compare_agents", (("agent_ids", tuple(_find_uuids(lower))),)
 
-    if any(kw in lower for kw in ["register", "sign up", "create agent", "onboard"]):
-        return "register_agent", {}
+    if "register_agent" in intents:
+        return "register_agent", ()
 
+    agent_id = _extract_did(lower) or _extract_agent_id(lower)
     if agent_id:
-        return "trust_check", {"agent_id": agent_id}
+        return "trust_check", (("agent_id", agent_id),)
+
+    return "trust_check", (("query", text),)
+
+
+def _data_part(data: dict) -> dict:
+    return {"data": data, "mediaType": "application/json"}
 
-    return "trust_check", {"query": text}
+
+def _store_task(task: dict) -> dict:
+    """Encode a task once, keep it for GetTask and wrap it as a SendMessageResponse dict."""
+    encoded = orjson.dumps(task)
+    _task_store[task["id"]] = encoded
+    return {"task": orjson.Fragment(encoded)}
+
+
+def _completed_task(artifact_name: str, data: dict) -> dict:
+    """Build a COMPLETED task dict carrying a single JSON data artifact."""
+    return _store_task({
+        "id": _new_id(),
+        "contextId": _new_id(),
+        "status": {"state": A2ATaskState.COMPLETED.value, "timestamp": _now_iso()},
+        "artifacts": [
+            {
+                "artifactId": _new_id(),
+                "name": artifact_name,
+                "parts": [_data_part(data)],
+            }
+        ],
+    })
 
 
-def _build_trust_check_result(agent_id: str) -> SendMessageResponse:
+def _build_trust_check_result(agent_id: str) -> dict:
     """Execute trust_check skill and wrap result in A2A SendMessageResponse."""
-    trust_data = get_a2a_trust(agent_id)
-    task_id = str(uuid.uuid4())
-    context_id = str(uuid.uuid4())
-    now = _now_iso()
+    trust_data = trust_cache.get(agent_id)
+    if trust_data is None:
+        trust_data = get_a2a_trust(agent_id)
+        if trust_data:
+            trust_cache[agent_id] = trust_data
 
     if not trust_data:
-        task = A2ATask(
-            id=task_id,
-            contextId=context_id,
-            status=A2ATaskStatus(
-                state=A2ATaskState.COMPLETED,
-                timestamp=now,
-            ),
-            artifacts=[
-                A2AArtifact(
-                    artifactId=str(uuid.uuid4()),
-                    name="Trust Verification Result",
-                    parts=[
-                        A2APart(
-                            data={
-                                "registered": False,
-                                "agent_id": agent_id,
-                                "trust_score": 0,
-                                "risk_level": "unknown",
-                                "recommendation": "unknown",
-                                "message": "This agent is not registered on GARL Protocol.",
-                                "register_url": "https://api.garl.ai/api/v1/agents/auto-register",
-                            },
-                            mediaType="application/json",
-                        )
-                    ],
-                )
-            ],
-        )
+        trust_data = {
+            "registered": False,
+            "agent_id": agent_id,
+            "trust_score": 0,
+            "risk_level": "unknown",
+            "recommendation": "unknown",
+            "message": "This agent is not registered on GARL Protocol.",
+            "register_url": "https://api.garl.ai/api/v1/agents/auto-register",
+        }
     else:
-        trust_data["registered"] = True
-        task = A2ATask(
-            id=task_id,
-            contextId=context_id,
-            status=A2ATaskStatus(
-                state=A2ATaskState.COMPLETED,
-                timestamp=now,
-            ),
-            artifacts=[
-                A2AArtifact(
-                    artifactId=str(uuid.uuid4()),
-                    name="Trust Verification Result",
-                    parts=[
-                        A2APart(data=trust_data, mediaType="application/json")
-                    ],
-                )
-            ],
-        )
+        trust_data = {**trust_data, "registered": True}
 
-    _task_store[task_id] = task.model_dump(exclude_none=True)
-    return SendMessageResponse(task=task)
+    return _completed_task("Trust Verification Result", trust_data)
 
 
-def _build_route_result(category: str) -> SendMessageResponse:
-    """Execute route_agent skill."""
+def _cached_route_data(category: str) -> dict:
+    """route_agents() result for a category, reused for _ROUTE_CACHE_TTL seconds."""
+    now = time.monotonic()
+    hit = _route_cache.get(category)
+    if hit and now - hit[0] < _ROUTE_CACHE_TTL:
+        return hit[1]
     route_data = route_agents(category, "silver", 3)
-    task_id = str(uuid.uuid4())
-    context_id = str(uuid.uuid4())
-    now = _now_iso()
-
-    task = A2ATask(
-        id=task_id,
-        contextId=context_id,
-        status=A2ATaskStatus(state=A2ATaskState.COMPLETED, timestamp=now),
-        artifacts=[
-            A2AArtifact(
-                artifactId=str(uuid.uuid4()),
-                name="Agent Routing Recommendations",
-                parts=[A2APart(data=route_data, mediaType="application/json")],
-            )
-        ],
-    )
-    _task_store[task_id] = task.model_dump(exclude_none=True)
-    return SendMessageResponse(task=task)
+    _route_cache[category] = (now, route_data)
+    return route_data
 
 
-def _build_compare_result(agent_ids: list[str]) -> SendMessageResponse:
-    """Execute compare_agents skill."""
-    task_id = str(uuid.uuid4())
-    context_id = str(uuid.uuid4())
-    now = _now_iso()
-
-    if len(agent_ids) < 2:
-        task = A2ATask(
-            id=task_id,
-            contextId=context_id,
-            status=A2ATaskStatus(
-                state=A2ATaskState.FAILED,
-                timestamp=now,
-                message=A2AMessage(
-                    messageId=str(uuid.uuid4()),
-                    role=A2AMessageRole.AGENT,
-                    parts=[A2APart(text="At least 2 agent IDs required for comparison.")],
-                ),
-            ),
-        )
-    else:
-        comparison = compare_agents(agent_ids)
-        task = A2ATask(
-            id=task_id,
-            contextId=context_id,
-            status=A2ATaskStatus(state=A2ATaskState.COMPLETED, timestamp=now),
-            artifacts=[
-                A2AArtifact(
-                    artifactId=str(uuid.uuid4()),
-                    name="Agent Comparison",
-                    parts=[A2APart(data={"agents": comparison}, mediaType="application/json")],
-                )
-            ],
-        )
+def _build_route_result(category: str) -> dict:
+    """Execute route_agent skill."""
+    return _completed_task("Agent Routing Recommendations", _cached_route_data(category))
 
-    _task_store[task_id] = task.model_dump(exclude_none=True)
-    return SendMessageResponse(task=task)
+
+def _build_compare_result(agent_ids: list[str]) -> dict:
+    """Execute compare_agents skill."""
+    if len(agent_ids) >= 2:
+        return _completed_task("Agent Comparison", {"agents": compare_agents(agent_ids)})
+
+    return _store_task({
+        "id": _new_id(),
+        "contextId": _new_id(),
+        "status": {
+            "state": A2ATaskState.FAILED.value,
+            "timestamp": _now_iso(),
+            "message": {
+                "messageId": _new_id(),
+                "role": A2AMessageRole.AGENT.value,
+                "parts": [{"text": "At least 2 agent IDs required for comparison."}],
+            },
+        },
+    })
+
+
+# Registration instructions never change; only messageId is filled per request.
+_REGISTER_INFO_MESSAGE = {
+    "role": A2AMessageRole.AGENT.value,
+    "parts": [
+        _data_part({
+            "action": "Register your agent on GARL Protocol",
+            "endpoint": "POST https://api.garl.ai/api/v1/agents/auto-register",
+            "required_fields": ["name"],
+            "optional_fields": ["framework", "category", "description"],
+            "example": {"name": "my-agent", "framework": "langchain"},
+            "documentation": "https://garl.ai/docs",
+        })
+    ],
+}
 
 
-def _build_register_info() -> SendMessageResponse:
+def _build_register_info() -> dict:
     """Return registration instructions as an A2A Message (no task needed)."""
-    return SendMessageResponse(
-        message=A2AMessage(
-            messageId=str(uuid.uuid4()),
-            role=A2AMessageRole.AGENT,
-            parts=[
-                A2APart(
-                    data={
-                        "action": "Register your agent on GARL Protocol",
-                        "endpoint": "POST https://api.garl.ai/api/v1/agents/auto-register",
-                        "required_fields": ["name"],
-                        "optional_fields": ["framework", "category", "description"],
-                        "example": {"name": "my-agent", "framework": "langchain"},
-                        "documentation": "https://garl.ai/docs",
-                    },
-                    mediaType="application/json",
-                )
-            ],
-        )
-    )
+    return {"message": {"messageId": _new_id(), **_REGISTER_INFO_MESSAGE}}
 
 
-def _handle_send_message(params: dict, req_id) -> dict:
+_INTENT_HANDLERS: dict[str, Callable[[dict], dict]] = {
+    "trust_check": lambda p: _build_trust_check_result(p["agent_id"]),
+    "route_agent": lambda p: _build_route_result(p.get("category", "other")),
+    "compare_agents": lambda p: _build_compare_result(list(p.get("agent_ids", ()))),
+    "register_agent": lambda p: _build_register_info(),
+}
+
+
+def _handle_send_message(params: dict, req_id: JSONRPCId) -> dict:
     """Handle SendMessage JSON-RPC method."""
     message_data = params.get("message")
     if not message_data:
@@ -249,111 +333,89 @@ def _handle_send_message(params: dict, req_id) -> dict:
     if not message_id:
         return _jsonrpc_error(req_id, -32602, "InvalidParams", {"detail": "message.messageId is required"})
 
-    text_content = ""
+    chunks: list[str] = []
     for part in parts:
         if not isinstance(part, dict):
             continue
-        if "text" in part and part["text"]:
-            text_content += part["text"] + " "
+        if text := part.get("text"):
+            chunks.append(text)
         elif "data" in part:
-            raw = part["data"]
-            if isinstance(raw, str):
+            d = part["data"]
+            if isinstance(d, str):
                 try:
-                    raw = json.loads(raw)
+                    d = json.loads(d)
                 except (json.JSONDecodeError, TypeError):
                     continue
-            if not isinstance(raw, dict):
+            if not isinstance(d, dict):
                 continue
-            d = raw
             if "agent_id" in d:
-                text_content += f"check trust {d['agent_id']} "
+                chunks.append(f"check trust {d['agent_id']}")
             if "skill" in d or "action" in d:
-                skill = d.get("skill") or d.get("action", "")
-                text_content += f"{skill} "
+                chunks.append(f"{d.get('skill') or d.get('action', '')}")
             if "category" in d:
-                text_content += f"{d['category']} "
-            if "agent_ids" in d and isinstance(d["agent_ids"], list):
-                text_content += "compare " + " ".join(str(i) for i in d["agent_ids"]) + " "
+                chunks.append(f"{d['category']}")
+            if isinstance(agent_ids := d.get("agent_ids"), list):
+                chunks.append("compare " + " ".join(str(i) for i in agent_ids))
 
-    text_content = text_content.strip()
+    text_content = " ".join(chunks).strip()
     if not text_content:
         return _jsonrpc_error(
             req_id, -32602, "InvalidParams",
             {"detail": "No actionable content found in message parts"},
         )
 
-    intent, intent_params = _detect_intent(text_content)
-
-    if intent == "trust_check":
-        agent_id = intent_params.get("agent_id")
-        if not agent_id:
-            return _jsonrpc_error(
-                req_id, -32602, "InvalidParams",
-                {"detail": "Could not extract agent ID from message. Provide a UUID or did:garl:UUID."},
-            )
-        response = _build_trust_check_result(agent_id)
+    intent, intent_pairs = _detect_intent(text_content)
+    intent_params = dict(intent_pairs)
 
-    elif intent == "route_agent":
-        response = _build_route_result(intent_params.get("category", "other"))
-
-    elif intent == "compare_agents":
-        response = _build_compare_result(intent_params.get("agent_ids", []))
-
-    elif intent == "register_agent":
-        response = _build_register_info()
+    if intent == "trust_check" and not intent_params.get("agent_id"):
+        return _jsonrpc_error(
+            req_id, -32602, "InvalidParams",
+            {"detail": "Could not extract agent ID from message. Provide a UUID or did:garl:UUID."},
+        )
 
-    else:
+    builder = _INTENT_HANDLERS.get(intent)
+    if not builder:
         return _jsonrpc_error(req_id, -32602, "InvalidParams", {"detail": "Could not determine intent."})
 
-    return JSONRPCResponse(
-        jsonrpc="2.0",
-        result=response.model_dump(exclude_none=True),
-        id=req_id,
-    ).model_dump(exclude_none=True)
+    return _jsonrpc_result(req_id, builder(intent_params))
 
 
-def _handle_get_task(params: dict, req_id) -> dict:
+def _handle_get_task(params: dict, req_id: JSONRPCId) -> dict:
     """Handle GetTask JSON-RPC method."""
     task_id = params.get("id")
     if not task_id:
         return _jsonrpc_error(req_id, -32602, "InvalidParams", {"detail": "id field is required"})
 
-    task_data = _task_store.get(task_id)
-    if not task_data:
+    encoded = _task_store.get(task_id)
+    if not encoded:
         return _jsonrpc_error(req_id, -32001, "TaskNotFoundError", {"taskId": task_id})
 
-    return JSONRPCResponse(
-        jsonrpc="2.0",
-        result=task_data,
-        id=req_id,
-    ).model_dump(exclude_none=True)
+    return _jsonrpc_result(req_id, orjson.Fragment(encoded))
 
 
-_METHOD_HANDLERS = {
+_METHOD_HANDLERS: dict[str, Callable[[dict, JSONRPCId], dict]] = {
     "SendMessage": _handle_send_message,
     "GetTask": _handle_get_task,
 }
 
 
-@a2a_router.post("/a2a")
-async def a2a_jsonrpc(request: Request):
-    """A2A v1.0 JSON-RPC 2.0 endpoint."""
-    try:
-        body = await request.json()
-    except Exception:
-        return _jsonrpc_error(None, -32700, "ParseError", {"detail": "Invalid JSON"})
+def _dispatch_jsonrpc(body: object) -> dict:
+    """Validate the JSON-RPC envelope and run the requested method."""
+    if not isinstance(body, dict):
+        return _jsonrpc_error(None, -32600, "InvalidRequest", {"detail": "request must be a JSON object"})
 
     req_id = body.get("id")
-    jsonrpc = body.get("jsonrpc")
-    method = body.get("method")
-    params = body.get("params", {})
-
-    if jsonrpc != "2.0":
+    if body.get("jsonrpc") != "2.0":
         return _jsonrpc_error(req_id, -32600, "InvalidRequest", {"detail": "jsonrpc must be '2.0'"})
 
+    method = body.get("method")
     if not method:
         return _jsonrpc_error(req_id, -32600, "InvalidRequest", {"detail": "method is required"})
 
+    params = body.get("params") or {}
+    if not isinstance(params, dict):
+        return _jsonrpc_error(req_id, -32602, "InvalidParams", {"detail": "params must be a JSON object"})
+
     handler = _METHOD_HANDLERS.get(method)
     if not handler:
         return _jsonrpc_error(
@@ -365,3 +427,14 @@ async def a2a_jsonrpc(request: Request):
         return handler(params, req_id)
     except Exception as exc:
         return _jsonrpc_error(req_id, -32603, "InternalError", {"detail": str(exc)})
+
+
+@a2a_router.post("/a2a", response_class=ORJSONResponse)
+async def a2a_jsonrpc(request: Request):
+    """A2A v1.0 JSON-RPC 2.0 endpoint."""
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        return ORJSONResponse(_jsonrpc_error(None, -32700, "ParseError", {"detail": "Invalid JSON"}))
+
+    return ORJSONResponse(_dispatch_jsonrpc(body))
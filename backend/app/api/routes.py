@@ -1,12 +1,17 @@
 import re
 import time
-import hashlib
-import threading
-from collections import defaultdict
-from html import escape as html_escape
-
+import uuid
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+
+import ahocorasick
+import orjson
+from cachetools import TTLCache
 from fastapi import APIRouter, HTTPException, Header, Request, Response
+from fastapi.responses import StreamingResponse
 
+from app.core import ratelimit
 from app.core.config import get_settings
 from app.core.supabase_client import get_supabase as _get_supabase
 
@@ -30,6 +35,7 @@ from app.services.agents import (
     get_agent,
     get_agent_detail,
     get_leaderboard,
+    iter_leaderboard,
     get_recent_traces,
     get_stats,
     get_a2a_trust,
@@ -46,78 +52,75 @@ from app.services.agents import (
     soft_delete_agent,
     anonymize_agent,
     get_compliance_report,
+    hash_api_key,
+    api_key_matches,
+    ownership_cache,
 )
-from app.services.traces import submit_trace
+from app.services.traces import submit_trace, submit_traces_bulk, invalidate_hooks_cache
 from app.core.signing import verify_signature, get_public_key_hex
 
 router = APIRouter(prefix="/api/v1", tags=["GARL Protocol"])
 
 
+_UUID_RE = re.compile(r"\A[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z")
+
+
 def _validate_uuid(value: str, name: str = "ID"):
-    import uuid as _uuid
+    # Canonical 8-4-4-4-12 ids take the regex; other spellings uuid.UUID
+    # accepts (braces, urn:uuid:, no dashes) still get the full parse.
+    if isinstance(value, str) and _UUID_RE.match(value):
+        return
     try:
-        _uuid.UUID(value)
+        uuid.UUID(value)
     except (ValueError, AttributeError):
         raise HTTPException(status_code=400, detail=f"Invalid {name} format. Expected UUID.")
 
 
-_rate_store: dict[str, list[float]] = defaultdict(list)
-_rate_lock = threading.Lock()
-_rate_last_cleanup = time.time()
-_CLEANUP_INTERVAL = 300
-
 RATE_LIMITS = {
     "default": (120, 60),
     "write": (20, 60),
     "batch": (10, 60),
     "register": (5, 60),
     "auto_register": (3, 300),
+    "export": (5, 300),
 }
 
 
-def _check_rate_limit(key: str, tier: str = "default"):
-    global _rate_last_cleanup
+async def _check_rate_limit(key: str, tier: str = "default"):
     limit, window = RATE_LIMITS.get(tier, RATE_LIMITS["default"])
-    now = time.time()
-    bucket = f"{tier}:{key}"
-    with _rate_lock:
-        if now - _rate_last_cleanup > _CLEANUP_INTERVAL:
-            stale_keys = [k for k, v in _rate_store.items() if not v or now - v[-1] > 120]
-            for k in stale_keys:
-                del _rate_store[k]
-            _rate_last_cleanup = now
-
-        _rate_store[bucket] = [t for t in _rate_store[bucket] if now - t < window]
-        if len(_rate_store[bucket]) >= limit:
-            remaining = 0
-            oldest = min(_rate_store[bucket]) if _rate_store[bucket] else now
-            retry_after = int(oldest + window - now) + 1
-            reset_at = int(oldest + window)
-            raise HTTPException(
-                status_code=429,
-                detail=f"Rate limit exceeded. Max {limit} requests per {window}s for this operation.",
-                headers={
-                    "Retry-After": str(retry_after),
-                    "X-RateLimit-Limit": str(limit),
-                    "X-RateLimit-Remaining": str(remaining),
-                    "X-RateLimit-Reset": str(reset_at),
-                },
-            )
-        _rate_store[bucket].append(now)
+    oldest = await ratelimit.hit(f"{tier}:{key}", limit, window)
+    if oldest is not None:
+        now = time.time()
+        retry_after = int(oldest + window - now) + 1
+        reset_at = int(oldest + window)
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded. Max {limit} requests per {window}s for this operation.",
+            headers={
+                "Retry-After": str(retry_after),
+                "X-RateLimit-Limit": str(limit),
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(reset_at),
+            },
+        )
 
 
 _AGENT_NAME_PATTERN = re.compile(r"^[\w\s\-\.]+$")
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
 
 
 def _sanitize_agent_name(name: str) -> str:
     """Validate and sanitize agent name: strip HTML, enforce length and charset."""
-    import re as _re
-    clean = _re.sub(r"<[^>]+>", "", name).strip()
+    clean = _HTML_TAG_RE.sub("", name).strip()
     if not clean:
         raise HTTPException(status_code=400, detail="Agent name must not be empty or contain only HTML tags.")
     if len(clean) > 100:
         clean = clean[:100]
-    if not _AGENT_NAME_PATTERN.match(clean):
+    # Common case: alphanumerics plus " _-." — str.isalnum() beats the regex
+    # there. Anything else (other whitespace, punctuation-only names) goes
+    # through the pattern, which stays the source of truth.
+    plain = clean.replace(" ", "").replace("_", "").replace("-", "").replace(".", "")
+    if not plain.isalnum() and not _AGENT_NAME_PATTERN.match(clean):
         raise HTTPException(
             status_code=400,
             detail="Agent name may only contain letters, numbers, spaces, hyphens, underscores, and dots.",
@@ -129,31 +132,49 @@ def _strip_html(text: str, max_length: int = 2000) -> str:
     """Strip HTML tags from free-text fields and enforce max length."""
     if not text:
         return text
-    clean = re.sub(r"<[^>]+>", "", text).strip()
-    if len(clean) > max_length:
-        clean = clean[:max_length]
-    return clean
+    # The schema validators have usually stripped tags already; a memchr
+    # scan for "<" is far cheaper than running the pattern over the text.
+    clean = _HTML_TAG_RE.sub("", text) if "<" in text else text
+    return clean.strip()[:max_length]
+
+
+def _strip_trace_html(trace: TraceSubmitRequest) -> None:
+    """Strip HTML from a trace's free-text fields in place."""
+    trace.task_description = _strip_html(trace.task_description, 1000)
+    if trace.input_summary:
+        trace.input_summary = _strip_html(trace.input_summary, 2000)
+    if trace.output_summary:
+        trace.output_summary = _strip_html(trace.output_summary, 2000)
 
 
 def _get_client_ip(request: Request) -> str:
-    """Extract real client IP behind Cloudflare/proxy."""
-    return (
-        request.headers.get("CF-Connecting-IP")
-        or request.headers.get("X-Forwarded-For", "").split(",")[0].strip()
-        or (request.client.host if request.client else "unknown")
-    )
+    """Extract real client IP behind Cloudflare/proxy, once per request."""
+    client_ip = getattr(request.state, "client_ip", None)
+    if client_ip is None:
+        headers = request.headers
+        client_ip = (
+            headers.get("cf-connecting-ip")
+            or headers.get("x-forwarded-for", "").split(",", 1)[0].strip()
+            or (request.client.host if request.client else "unknown")
+        )
+        request.state.client_ip = client_ip
+    return client_ip
 
 
 def _verify_agent_ownership(agent_id: str, api_key: str) -> dict:
     """API key ownership verification."""
+    cached_hash = ownership_cache.get(agent_id)
+    if cached_hash and api_key_matches(api_key, cached_hash):
+        return {"id": agent_id, "api_key_hash": cached_hash}
+
     db = _get_supabase()
     agent_res = db.table("agents").select("id, api_key_hash").eq("id", agent_id).execute()
     if not agent_res.data:
         raise HTTPException(status_code=404, detail="Agent not found")
     expected_hash = agent_res.data[0].get("api_key_hash", "")
-    provided_hash = hashlib.sha256(api_key.encode()).hexdigest()
-    if expected_hash != provided_hash:
+    if not api_key_matches(api_key, expected_hash):
         raise HTTPException(status_code=403, detail="API key does not belong to this agent")
+    ownership_cache[agent_id] = expected_hash
     return agent_res.data[0]
 
 
@@ -171,7 +192,7 @@ def _require_read_auth(x_api_key: str | None):
 
 @router.post("/agents", response_model=AgentResponse)
 async def create_agent(request: Request, req: AgentRegisterRequest):
-    _check_rate_limit(_get_client_ip(request), "register")
+    await _check_rate_limit(_get_client_ip(request), "register")
     req.name = _sanitize_agent_name(req.name)
     if req.description:
         req.description = _strip_html(req.description, 500)
@@ -188,7 +209,7 @@ async def create_agent(request: Request, req: AgentRegisterRequest):
 @router.post("/agents/auto-register")
 async def auto_register_agent(request: Request, req: AutoRegisterRequest):
     """Otonom ajanlar için sadeleştirilmiş kayıt: minimum alan, makine-okunabilir talimatlar."""
-    _check_rate_limit(_get_client_ip(request), "auto_register")
+    await _check_rate_limit(_get_client_ip(request), "auto_register")
     req.name = _sanitize_agent_name(req.name)
     if req.description:
         req.description = _strip_html(req.description, 500)
@@ -279,22 +300,40 @@ async def read_agent_detail(agent_id: str):
     return detail
 
 
+def _parse_cursor(cursor: str | None) -> str | None:
+    """Validate a created_at keyset cursor (ISO 8601)."""
+    if cursor is None:
+        return None
+    try:
+        # An unencoded "+00:00" offset arrives as " 00:00".
+        return datetime.fromisoformat(cursor.replace(" ", "+")).isoformat()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor format. Expected ISO 8601 timestamp.")
+
+
 @router.get("/agents/{agent_id}/traces")
-async def read_agent_traces(agent_id: str, limit: int = 20, offset: int = 0):
-    """Public endpoint: recent traces for a specific agent."""
+async def read_agent_traces(agent_id: str, limit: int = 20, offset: int = 0, cursor: str | None = None):
+    """Public endpoint: recent traces for a specific agent.
+
+    Pass the created_at of the last trace seen as cursor to page without
+    OFFSET; offset is kept for existing clients.
+    """
     _validate_uuid(agent_id, "agent_id")
     limit = max(1, min(limit, 100))
     offset = max(0, offset)
+    cursor = _parse_cursor(cursor)
     from app.core.supabase_client import get_supabase
     db = get_supabase()
-    res = (
+    query = (
         db.table("traces")
         .select("id,agent_id,task_description,status,duration_ms,category,trust_delta,created_at")
         .eq("agent_id", agent_id)
-        .order("created_at", desc=True)
-        .range(offset, offset + limit - 1)
-        .execute()
     )
+    if cursor:
+        query = query.lt("created_at", cursor).order("created_at", desc=True).limit(limit)
+    else:
+        query = query.order("created_at", desc=True).range(offset, offset + limit - 1)
+    res = query.execute()
     return res.data or []
 
 
@@ -311,12 +350,8 @@ async def read_agent_card(agent_id: str):
 
 @router.post("/verify", response_model=TraceResponse)
 async def verify_trace(request: Request, req: TraceSubmitRequest, x_api_key: str = Header(...)):
-    _check_rate_limit(x_api_key[:16], "write")
-    req.task_description = _strip_html(req.task_description, 1000)
-    if hasattr(req, "input_summary") and req.input_summary:
-        req.input_summary = _strip_html(req.input_summary, 2000)
-    if hasattr(req, "output_summary") and req.output_summary:
-        req.output_summary = _strip_html(req.output_summary, 2000)
+    await _check_rate_limit(x_api_key[:16], "write")
+    _strip_trace_html(req)
     try:
         result = submit_trace(req, x_api_key)
         return result
@@ -330,31 +365,24 @@ async def verify_trace(request: Request, req: TraceSubmitRequest, x_api_key: str
 
 @router.post("/verify/batch")
 async def verify_batch(request: Request, req: BatchTraceRequest, x_api_key: str = Header(...)):
-    _check_rate_limit(x_api_key[:16], "batch")
+    await _check_rate_limit(x_api_key[:16], "batch")
 
     agent_ids = {t.agent_id for t in req.traces}
     if len(agent_ids) > 1:
         raise HTTPException(status_code=400, detail="All traces in a batch must belong to the same agent")
 
-    results = []
-    failed = 0
     for trace in req.traces:
-        trace.task_description = _strip_html(trace.task_description, 1000)
-        if hasattr(trace, "input_summary") and trace.input_summary:
-            trace.input_summary = _strip_html(trace.input_summary, 2000)
-        if hasattr(trace, "output_summary") and trace.output_summary:
-            trace.output_summary = _strip_html(trace.output_summary, 2000)
-        try:
-            result = submit_trace(trace, x_api_key)
-            results.append({"id": result["id"], "status": "ok", "trust_delta": result["trust_delta"]})
-        except (ValueError, PermissionError) as e:
-            results.append({"status": "error", "detail": str(e)})
-            failed += 1
-        except Exception as e:
-            results.append({"status": "error", "detail": str(e)})
-            failed += 1
-
-    return {"submitted": len(results) - failed, "failed": failed, "results": results}
+        _strip_trace_html(trace)
+
+    # One agent, so ownership and deactivation errors apply to every trace.
+    try:
+        submitted = submit_traces_bulk(req.traces, x_api_key)
+    except Exception as e:
+        error = {"status": "error", "detail": str(e)}
+        return {"submitted": 0, "failed": len(req.traces), "results": [dict(error) for _ in req.traces]}
+
+    results = [{"id": r["id"], "status": "ok", "trust_delta": r["trust_delta"]} for r in submitted]
+    return {"submitted": len(results), "failed": 0, "results": results}
 
 
 @router.post("/verify/check")
@@ -365,9 +393,52 @@ async def check_certificate(certificate: dict):
 
 # --- Discovery & Ranking ---
 
+def _parse_leaderboard_cursor(cursor: str | None) -> tuple[int, float, str] | None:
+    """Validate a "rank,trust_score,id" leaderboard keyset cursor."""
+    if cursor is None:
+        return None
+    try:
+        rank, score, agent_id = cursor.split(",")
+        # Canonical forms only: these values are interpolated into a PostgREST filter.
+        rank, score, agent_id = int(rank), float(score), str(uuid.UUID(agent_id))
+    except ValueError:
+        rank = -1
+    if rank < 0 or not 0 <= score <= 100:
+        raise HTTPException(status_code=400, detail="Invalid cursor format. Expected rank,trust_score,id.")
+    return rank, score, agent_id
+
+
+# Read-heavy discovery endpoints whose data moves on trace/decay
+# timescales: a short TTL absorbs bursts. Keyed by normalized query args.
+_leaderboard_cache: TTLCache = TTLCache(maxsize=512, ttl=60)
+_stats_cache: TTLCache = TTLCache(maxsize=1, ttl=60)
+
+
 @router.get("/leaderboard")
-async def leaderboard(category: str | None = None, limit: int = 50, offset: int = 0):
-    return get_leaderboard(category, max(1, min(limit, 100)), max(0, offset))
+async def leaderboard(category: str | None = None, limit: int = 50, offset: int = 0, cursor: str | None = None):
+    """Ranked agents.
+
+    Pass "rank,trust_score,id" of the last entry seen as cursor to page
+    without OFFSET; offset is kept for existing clients.
+    """
+    key = (category, max(1, min(limit, 100)), max(0, offset), _parse_leaderboard_cursor(cursor))
+    entries = _leaderboard_cache.get(key)
+    if entries is None:
+        entries = _leaderboard_cache[key] = get_leaderboard(*key)
+    return entries
+
+
+@router.get("/leaderboard/export")
+async def leaderboard_export(request: Request, category: str | None = None):
+    """The full leaderboard as NDJSON, one ranked agent per line.
+
+    Rows are read in keyset pages and streamed, so memory stays at one page
+    however many agents are ranked. Each call walks the whole agents table,
+    so it is rate limited per client.
+    """
+    await _check_rate_limit(_get_client_ip(request), "export")
+    rows = (orjson.dumps(row) + b"\n" for row in iter_leaderboard(category))
+    return StreamingResponse(rows, media_type="application/x-ndjson")
 
 
 @router.get("/feed")
@@ -377,7 +448,10 @@ async def activity_feed(limit: int = 20):
 
 @router.get("/stats")
 async def protocol_stats():
-    return get_stats()
+    stats = _stats_cache.get("stats")
+    if stats is None:
+        stats = _stats_cache["stats"] = get_stats()
+    return stats
 
 
 # --- A2A Trust ---
@@ -421,18 +495,19 @@ async def trust_route(category: str, min_tier: str = "silver", limit: int = 3):
 # --- Trust History ---
 
 @router.get("/agents/{agent_id}/history")
-async def read_agent_history(agent_id: str, limit: int = 50):
+async def read_agent_history(agent_id: str, limit: int = 50, cursor: str | None = None):
     _validate_uuid(agent_id, "agent_id")
+    cursor = _parse_cursor(cursor)
     from app.core.supabase_client import get_supabase
     db = get_supabase()
-    res = (
+    query = (
         db.table("reputation_history")
         .select("trust_score, event_type, trust_delta, score_reliability, score_speed, score_cost_efficiency, score_consistency, score_security, created_at")
         .eq("agent_id", agent_id)
-        .order("created_at", desc=True)
-        .limit(max(1, min(limit, 200)))
-        .execute()
     )
+    if cursor:
+        query = query.lt("created_at", cursor)
+    res = query.order("created_at", desc=True).limit(max(1, min(limit, 200))).execute()
     return res.data or []
 
 
@@ -451,35 +526,31 @@ async def compare(agents: str):
 
 # --- Badges ---
 
-@router.get("/badge/svg/{agent_id}")
-async def badge_svg(agent_id: str):
-    _validate_uuid(agent_id, "agent_id")
-    agent = get_agent(agent_id)
-    if not agent:
-        raise HTTPException(status_code=404, detail="Agent not found")
+_BADGE_TIER_COLORS = {
+    "enterprise": "#a855f7",
+    "gold": "#f59e0b",
+    "silver": "#94a3b8",
+    "bronze": "#92400e",
+}
 
-    score = float(agent["trust_score"])
-    name = html_escape(agent["name"][:20])
-    tier = agent.get("certification_tier", "bronze")
+# agent_id -> _render_badge_svg args; badges are hit far more often than
+# scores change, and clients already cache them for 300s.
+_badge_agent_cache: TTLCache = TTLCache(maxsize=4096, ttl=30)
 
-    tier_colors = {
-        "enterprise": "#a855f7",
-        "gold": "#f59e0b",
-        "silver": "#94a3b8",
-        "bronze": "#92400e",
-    }
-    color = tier_colors.get(tier, "#00ff88")
+
+@lru_cache(maxsize=8192)
+def _render_badge_svg(value: str, tier: str, verified: bool) -> bytes:
+    color = _BADGE_TIER_COLORS.get(tier, "#00ff88")
 
     label = f"GARL {tier.upper()}"
-    value = f"{score:.1f}"
-    verified = " ✓" if agent["total_traces"] >= 10 else ""
+    check = " ✓" if verified else ""
 
     label_width = len(label) * 7 + 10
-    value_width = len(value + verified) * 7 + 14
+    value_width = len(value + check) * 7 + 14
     total_width = label_width + value_width
 
     svg = f'''<svg xmlns="http://www.w3.org/2000/svg" width="{total_width}" height="20" role="img" aria-label="{label}: {value}">
-  <title>{label}: {value}{verified}</title>
+  <title>{label}: {value}{check}</title>
   <linearGradient id="s" x2="0" y2="100%">
     <stop offset="0" stop-color="#bbb" stop-opacity=".1"/>
     <stop offset="1" stop-opacity=".1"/>
@@ -492,21 +563,35 @@ async def badge_svg(agent_id: str):
   </g>
   <g fill="#fff" text-anchor="middle" font-family="Verdana,Geneva,DejaVu Sans,sans-serif" text-rendering="geometricPrecision" font-size="11">
     <text x="{label_width/2}" y="14" fill="#e4e4e7">{label}</text>
-    <text x="{label_width + value_width/2}" y="14" fill="#0a0a0f" font-weight="bold">{value}{verified}</text>
+    <text x="{label_width + value_width/2}" y="14" fill="#0a0a0f" font-weight="bold">{value}{check}</text>
   </g>
 </svg>'''
+    return svg.encode()
+
+
+@router.get("/badge/svg/{agent_id}")
+async def badge_svg(agent_id: str):
+    _validate_uuid(agent_id, "agent_id")
+    badge = _badge_agent_cache.get(agent_id)
+    if badge is None:
+        agent = get_agent(agent_id)
+        if not agent:
+            raise HTTPException(status_code=404, detail="Agent not found")
+        badge = (
+            f"{float(agent['trust_score']):.1f}",
+            agent.get("certification_tier", "bronze"),
+            agent["total_traces"] >= 10,
+        )
+        _badge_agent_cache[agent_id] = badge
 
     return Response(
-        content=svg,
+        content=_render_badge_svg(*badge),
         media_type="image/svg+xml",
-        headers={"Cache-Control": "public, max-age=300"},
+        headers={"Cache-Control": "public, max-age=300, s-maxage=900"},
     )
 
 
-@router.get("/badge/widget.js")
-async def badge_widget_js():
-    """Embeddable JS widget: <script src="https://api.garl.ai/api/v1/badge/widget.js" data-agent-id="UUID"></script>"""
-    js = '''(function(){
+_WIDGET_JS = b'''(function(){
   var s=document.currentScript;
   if(!s) return;
   var id=s.getAttribute("data-agent-id");
@@ -524,10 +609,20 @@ async def badge_widget_js():
   el.appendChild(img);
   s.parentNode.insertBefore(el,s.nextSibling);
 })();'''
+# Bump when _WIDGET_JS changes.
+_WIDGET_ETAG = 'W/"widget-v1"'
+_WIDGET_HEADERS = {"Cache-Control": "public, max-age=300", "ETag": _WIDGET_ETAG}
+
+
+@router.get("/badge/widget.js")
+async def badge_widget_js(request: Request):
+    """Embeddable JS widget: <script src="https://api.garl.ai/api/v1/badge/widget.js" data-agent-id="UUID"></script>"""
+    if request.headers.get("If-None-Match") == _WIDGET_ETAG:
+        return Response(status_code=304, headers=_WIDGET_HEADERS)
     return Response(
-        content=js,
+        content=_WIDGET_JS,
         media_type="application/javascript",
-        headers={"Cache-Control": "public, max-age=300"},
+        headers=_WIDGET_HEADERS,
     )
 
 
@@ -556,6 +651,7 @@ async def create_webhook(req: WebhookRegisterRequest, x_api_key: str = Header(..
     _validate_uuid(req.agent_id, "agent_id")
     _verify_agent_ownership(req.agent_id, x_api_key)
     hook = register_webhook(req.agent_id, req.url, req.events)
+    invalidate_hooks_cache(req.agent_id)
     return hook
 
 
@@ -566,14 +662,19 @@ async def list_agent_webhooks(agent_id: str, x_api_key: str = Header(...)):
     return list_webhooks(agent_id)
 
 
+_WEBHOOK_UPDATE_FIELDS = tuple(WebhookUpdateRequest.model_fields)
+
+
 @router.patch("/webhooks/{agent_id}/{webhook_id}")
 async def patch_webhook(agent_id: str, webhook_id: str, req: WebhookUpdateRequest, x_api_key: str = Header(...)):
     _validate_uuid(agent_id, "agent_id")
     _validate_uuid(webhook_id, "webhook_id")
     _verify_agent_ownership(agent_id, x_api_key)
-    result = update_webhook(webhook_id, agent_id, req.model_dump(exclude_none=True))
+    updates = {k: v for k in _WEBHOOK_UPDATE_FIELDS if (v := getattr(req, k)) is not None}
+    result = update_webhook(webhook_id, agent_id, updates)
     if not result:
         raise HTTPException(status_code=404, detail="Webhook not found")
+    invalidate_hooks_cache(agent_id)
     return result
 
 
@@ -585,6 +686,7 @@ async def remove_webhook(agent_id: str, webhook_id: str, x_api_key: str = Header
     deleted = delete_webhook(webhook_id, agent_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Webhook not found")
+    invalidate_hooks_cache(agent_id)
     return {"deleted": True}
 
 
@@ -592,11 +694,11 @@ async def remove_webhook(agent_id: str, webhook_id: str, x_api_key: str = Header
 
 @router.post("/endorse")
 async def endorse_agent(req: EndorsementRequest, x_api_key: str = Header(...)):
-    _check_rate_limit(x_api_key[:16])
+    await _check_rate_limit(x_api_key[:16])
     _validate_uuid(req.target_agent_id, "target_agent_id")
 
     db = _get_supabase()
-    endorser_res = db.table("agents").select("id, api_key_hash").eq("api_key_hash", hashlib.sha256(x_api_key.encode()).hexdigest()).execute()
+    endorser_res = db.table("agents").select("id, api_key_hash").eq("api_key_hash", hash_api_key(x_api_key)).execute()
     if not endorser_res.data:
         raise HTTPException(status_code=403, detail="Invalid API key")
     endorser_id = endorser_res.data[0]["id"]
@@ -610,10 +712,27 @@ async def endorse_agent(req: EndorsementRequest, x_api_key: str = Header(...)):
         raise HTTPException(status_code=403, detail=str(e))
 
 
+def _parse_endorsement_cursor(cursor: str | None) -> tuple[str, str] | None:
+    """Validate a "created_at,id" endorsements keyset cursor."""
+    if cursor is None:
+        return None
+    try:
+        created_at, endorsement_id = cursor.rsplit(",", 1)
+        # Canonical forms only: these values are interpolated into a PostgREST filter.
+        created_at = datetime.fromisoformat(created_at.replace(" ", "+")).isoformat()
+        return created_at, str(uuid.UUID(endorsement_id))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor format. Expected created_at,id.")
+
+
 @router.get("/endorsements/{agent_id}")
-async def read_endorsements(agent_id: str):
+async def read_endorsements(agent_id: str, limit: int = 100, cursor: str | None = None):
+    """Endorsements received and given, newest first.
+
+    Pass the returned next_cursor as cursor to fetch the next page.
+    """
     _validate_uuid(agent_id, "agent_id")
-    return get_endorsements(agent_id)
+    return get_endorsements(agent_id, max(1, min(limit, 100)), _parse_endorsement_cursor(cursor))
 
 
 # --- GDPR & Data Protection ---
@@ -672,18 +791,30 @@ CATEGORY_KEYWORDS = {
 }
 
 
+_KEYWORD_CATEGORIES: dict[str, list[str]] = {}
+for _cat, _keywords in CATEGORY_KEYWORDS.items():
+    for _kw in _keywords:
+        _KEYWORD_CATEGORIES.setdefault(_kw, []).append(_cat)
+
+# Aho-Corasick reports every keyword occurrence, overlapping ones included
+# ("data" inside "database"), in one pass over the message.
+_CATEGORY_AUTOMATON = ahocorasick.Automaton()
+for _kw in _KEYWORD_CATEGORIES:
+    _CATEGORY_AUTOMATON.add_word(_kw, _kw)
+_CATEGORY_AUTOMATON.make_automaton()
+
+
 def _infer_category(message: str) -> str:
-    msg_lower = message.lower()
-    scores = {}
-    for cat, keywords in CATEGORY_KEYWORDS.items():
-        scores[cat] = sum(1 for kw in keywords if kw in msg_lower)
-    best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "other"
+    found = {kw for _, kw in _CATEGORY_AUTOMATON.iter(message.lower())}
+    if not found:
+        return "other"
+    scores = Counter(cat for kw in found for cat in _KEYWORD_CATEGORIES[kw])
+    return max(CATEGORY_KEYWORDS, key=lambda cat: scores[cat])
 
 
 @router.post("/ingest/openclaw")
 async def ingest_openclaw(request: Request, payload: OpenClawIngestPayload, x_api_key: str = Header(...)):
-    _check_rate_limit(x_api_key[:16])
+    await _check_rate_limit(x_api_key[:16])
 
     status = "failure" if payload.error else payload.status
     if status not in ("success", "failure", "partial"):
@@ -695,12 +826,14 @@ async def ingest_openclaw(request: Request, payload: OpenClawIngestPayload, x_ap
     if payload.usage and "cost_usd" in payload.usage:
         cost_usd = payload.usage["cost_usd"]
 
+    # Only name and duration are kept; a generator lets Pydantic build the
+    # ToolCall list directly instead of copying through an interim list.
     tool_calls_data = None
     if payload.tool_calls:
-        tool_calls_data = [
+        tool_calls_data = (
             {"name": tc.get("name", "unknown"), "duration_ms": tc.get("duration_ms")}
             for tc in payload.tool_calls
-        ]
+        )
 
     trace_req = TraceSubmitRequest(
         agent_id=payload.agent_id,
@@ -17,6 +17,11 @@ class Settings(BaseSettings):
 
     read_auth_enabled: bool = True
 
+    redis_url: str = ""
+
+    # Seconds between background decay passes over idle agents; 0 disables.
+    decay_interval_seconds: int = 300
+
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:3001"]
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
@@ -0,0 +1,138 @@
+"""
+Sliding-window rate limiter.
+
+With REDIS_URL set, each bucket is a Redis sorted set of request timestamps
+that one Lua script trims, counts and appends to atomically, so limits hold
+across Uvicorn workers and restarts. Without Redis, or while it is
+unreachable, a process-local window is used instead.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import defaultdict
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] = bucket key
+# ARGV = now_ms, window_ms, limit, unique request id
+# Returns {} when the request is admitted, otherwise {oldest_member, oldest_score}.
+_SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+local n = redis.call('ZCARD', KEYS[1])
+if n >= tonumber(ARGV[3]) then
+    return redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+end
+redis.call('ZADD', KEYS[1], now, ARGV[1] .. ':' .. ARGV[4])
+redis.call('PEXPIRE', KEYS[1], window)
+return {}
+"""
+
+_redis_script = None
+_redis_checked = False
+
+# After a Redis error, requests skip Redis for this many seconds instead of
+# each waiting out the connect timeout, then the next one tries it again.
+REDIS_RETRY_AFTER = 10
+_redis_down_until = 0.0
+
+
+def _get_redis_script():
+    """Lazily connect to Redis and register the window script (None if not configured)."""
+    global _redis_script, _redis_checked
+    if _redis_checked:
+        return _redis_script
+    _redis_checked = True
+
+    settings = get_settings()
+    if not settings.redis_url:
+        return None
+
+    client = Redis.from_url(settings.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+    _redis_script = client.register_script(_SLIDING_WINDOW_LUA)
+    return _redis_script
+
+
+# --- Process-local fallback ---
+
+_local_store: dict[str, list[float]] = defaultdict(list)
+_bucket_locks: dict[str, asyncio.Lock] = {}
+_bucket_locks_loop: asyncio.AbstractEventLoop | None = None
+_local_last_cleanup = time.time()
+_CLEANUP_INTERVAL = 300
+
+
+def _lock_for(bucket: str) -> asyncio.Lock:
+    """Per-bucket asyncio.Lock, so unrelated keys never wait on each other.
+
+    No guard lock is needed around the map: nothing awaits between the
+    lookup and the insert. Locks are bound to a loop, so the map is reset
+    when a new one is running (tests, reloads).
+    """
+    global _bucket_locks_loop
+    loop = asyncio.get_running_loop()
+    if _bucket_locks_loop is not loop:
+        _bucket_locks.clear()
+        _bucket_locks_loop = loop
+    lock = _bucket_locks.get(bucket)
+    if lock is None:
+        lock = _bucket_locks[bucket] = asyncio.Lock()
+    return lock
+
+
+def _evict_stale(now: float) -> None:
+    stale_keys = [k for k, v in _local_store.items() if not v or now - v[-1] > 120]
+    for k in stale_keys:
+        lock = _bucket_locks.get(k)
+        if lock is not None and lock.locked():
+            continue
+        _local_store.pop(k, None)
+        _bucket_locks.pop(k, None)
+
+
+async def _hit_local(bucket: str, limit: int, window: int, now: float) -> float | None:
+    global _local_last_cleanup
+    if now - _local_last_cleanup > _CLEANUP_INTERVAL:
+        _local_last_cleanup = now
+        _evict_stale(now)
+
+    async with _lock_for(bucket):
+        timestamps = [t for t in _local_store[bucket] if now - t < window]
+        _local_store[bucket] = timestamps
+        if len(timestamps) >= limit:
+            return timestamps[0] if timestamps else now
+        timestamps.append(now)
+    return None
+
+
+async def hit(bucket: str, limit: int, window: int) -> float | None:
+    """Record one request against bucket.
+
+    Returns None when the request is admitted, or the epoch timestamp of the
+    oldest request still in the window when the limit is already reached.
+    """
+    global _redis_down_until
+    now = time.time()
+    script = _get_redis_script()
+    if script is not None and now >= _redis_down_until:
+        try:
+            res = await script(
+                keys=[f"rl:{bucket}"],
+                args=[int(now * 1000), window * 1000, limit, uuid.uuid4().hex],
+            )
+            return float(res[1]) / 1000.0 if res else None
+        except (RedisError, OSError) as e:
+            _redis_down_until = now + REDIS_RETRY_AFTER
+            logger.warning(
+                "Redis rate limiter unavailable, using local window for %ss: %s",
+                REDIS_RETRY_AFTER, e,
+            )
+    return await _hit_local(bucket, limit, window, now)
@@ -1,18 +1,40 @@
 import hashlib
 import json
 import logging
+import re
 import time
-from ecdsa import SigningKey, VerifyingKey, SECP256k1, BadSignatureError
-from ecdsa.errors import MalformedPointError
+
+import orjson
+from coincurve import PrivateKey, PublicKey
+from coincurve.ecdsa import cdata_to_der, deserialize_compact, signature_normalize
 
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
-_signing_key: SigningKey | None = None
+_signing_key: PrivateKey | None = None
+# (key, hex) so a replaced signing key is never paired with a stale hex.
+_public_key_hex: tuple[PrivateKey, str] | None = None
+
+# Output where orjson can differ from json.dumps(sort_keys=True): non-ASCII
+# and DEL (json escapes them), float exponents, floats below 1e-4 (json
+# switches to e-notation) and null (orjson writes NaN/Infinity as null).
+# A hit, even inside a string, falls back to json so that digests of
+# existing certificates never change.
+_ORJSON_UNSAFE_RE = re.compile(rb"[^\x00-\x7e]|\d[eE]|\.0000|null")
+
+
+def _canonical_json(data: dict) -> bytes:
+    try:
+        encoded = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        encoded = None
+    if encoded is None or _ORJSON_UNSAFE_RE.search(encoded):
+        return json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+    return encoded
 
 
-def _get_signing_key() -> SigningKey:
+def _get_signing_key() -> PrivateKey:
     global _signing_key
     if _signing_key is not None:
         return _signing_key
@@ -20,7 +42,7 @@ def _get_signing_key() -> SigningKey:
     settings = get_settings()
     if not settings.signing_private_key_hex:
         if settings.debug:
-            _signing_key = SigningKey.generate(curve=SECP256k1)
+            _signing_key = PrivateKey()
             logger.warning(
                 "SIGNING_PRIVATE_KEY_HEX not set — ephemeral key generated. "
                 "Certificates will NOT survive restarts. Set this in production."
@@ -28,28 +50,31 @@ def _get_signing_key() -> SigningKey:
             return _signing_key
         raise RuntimeError(
             "SIGNING_PRIVATE_KEY_HEX is required. Generate one with: "
-            "python3 -c \"from ecdsa import SigningKey, SECP256k1; print(SigningKey.generate(SECP256k1).to_string().hex())\""
+            "python3 -c \"from coincurve import PrivateKey; print(PrivateKey().to_hex())\""
         )
 
     try:
-        _signing_key = SigningKey.from_string(
-            bytes.fromhex(settings.signing_private_key_hex), curve=SECP256k1
-        )
+        _signing_key = PrivateKey(bytes.fromhex(settings.signing_private_key_hex))
     except (ValueError, Exception) as e:
         raise RuntimeError(f"Invalid SIGNING_PRIVATE_KEY_HEX: {e}") from e
     return _signing_key
 
 
 def get_public_key_hex() -> str:
-    return _get_signing_key().get_verifying_key().to_string().hex()
+    global _public_key_hex
+    sk = _get_signing_key()
+    if _public_key_hex is None or _public_key_hex[0] is not sk:
+        # Raw 64-byte x||y, the format certificates have always carried.
+        _public_key_hex = (sk, sk.public_key.format(compressed=False)[1:].hex())
+    return _public_key_hex[1]
 
 
 def sign_trace(trace_data: dict) -> dict:
     """Sign a trace payload and return a Proof-of-Success certificate."""
     sk = _get_signing_key()
-    canonical = json.dumps(trace_data, sort_keys=True, separators=(",", ":"))
-    digest = hashlib.sha256(canonical.encode()).digest()
-    signature = sk.sign_digest(digest).hex()
+    digest = hashlib.sha256(_canonical_json(trace_data)).digest()
+    # Compact 64-byte r||s, without the recovery id.
+    signature = sk.sign_recoverable(digest, hasher=None)[:64].hex()
 
     return {
         "@context": "https://garl.io/schema/v1",
@@ -68,11 +93,14 @@ def verify_signature(certificate: dict) -> bool:
     proof = certificate.get("proof", {})
     payload = certificate.get("payload", {})
     try:
-        vk = VerifyingKey.from_string(
-            bytes.fromhex(proof["publicKey"]), curve=SECP256k1
-        )
-        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-        digest = hashlib.sha256(canonical.encode()).digest()
-        return vk.verify_digest(bytes.fromhex(proof["signature"]), digest)
-    except (BadSignatureError, KeyError, ValueError, MalformedPointError, TypeError):
+        vk = PublicKey(b"\x04" + bytes.fromhex(proof["publicKey"]))
+        signature = bytes.fromhex(proof["signature"])
+        if len(signature) != 64:
+            return False
+        # libsecp256k1 only accepts low-S signatures; certificates issued by
+        # the old python-ecdsa signer may carry high-S ones, so normalize.
+        _, sig = signature_normalize(deserialize_compact(signature))
+        digest = hashlib.sha256(_canonical_json(payload)).digest()
+        return vk.verify(cdata_to_der(sig), digest, hasher=None)
+    except (KeyError, ValueError, TypeError):
         return False
@@ -1,8 +1,30 @@
+import httpx
+from postgrest.utils import SyncClient as PostgrestSession
 from supabase import create_client, Client
 from app.core.config import get_settings
 
 _client: Client | None = None
 
+# supabase-py's PostgREST session uses httpx defaults (10 keep-alive, 100
+# max connections, no pool timeout, 120s read). Bound waits so a stalled
+# Supabase fails fast, and keep enough warm connections for concurrent
+# requests. retries= only re-attempts failed connects, never a sent request.
+_DB_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30.0)
+_DB_TIMEOUT = httpx.Timeout(connect=2.0, read=10.0, write=10.0, pool=5.0)
+_DB_CONNECT_RETRIES = 2
+
+
+def _pooled_session(session: httpx.Client) -> PostgrestSession:
+    return PostgrestSession(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=_DB_TIMEOUT,
+        follow_redirects=True,
+        transport=httpx.HTTPTransport(
+            http2=True, limits=_DB_LIMITS, retries=_DB_CONNECT_RETRIES
+        ),
+    )
+
 
 def get_supabase() -> Client:
     global _client
@@ -12,5 +34,18 @@ def get_supabase() -> Client:
             raise RuntimeError(
                 "Supabase not configured. Set SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY."
             )
-        _client = create_client(settings.supabase_url, settings.supabase_service_role_key)
+        client = create_client(settings.supabase_url, settings.supabase_service_role_key)
+        postgrest = client.postgrest
+        default_session = postgrest.session
+        postgrest.session = _pooled_session(default_session)
+        default_session.close()
+        _client = client
     return _client
+
+
+def close_supabase() -> None:
+    """Close pooled PostgREST connections (app shutdown)."""
+    global _client
+    if _client is not None:
+        _client.postgrest.session.close()
+        _client = None
@@ -0,0 +1,25 @@
+"""
+Periodic time decay for idle agents.
+
+Read paths serve stored scores; this loop keeps them current by running
+decay_stale_agents() every DECAY_INTERVAL_SECONDS. The Supabase client is
+synchronous, so each pass runs in a worker thread.
+"""
+
+import asyncio
+import logging
+
+from app.services.agents import decay_stale_agents
+
+logger = logging.getLogger(__name__)
+
+
+async def run_decay_worker(interval: float) -> None:
+    while True:
+        try:
+            updated = await asyncio.to_thread(decay_stale_agents)
+            if updated:
+                logger.info("Decay pass updated %d agents", updated)
+        except Exception as e:
+            logger.warning("Decay pass failed: %s", e)
+        await asyncio.sleep(interval)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class A2ATaskState(str, Enum):
@@ -21,7 +21,13 @@ class A2AMessageRole(str, Enum):
     AGENT = "ROLE_AGENT"
 
 
-class A2APart(BaseModel):
+class _A2AModel(BaseModel):
+    # The /a2a handler works on plain dicts, so these models are schema
+    # documentation; build their validators on first use, not at import.
+    model_config = ConfigDict(defer_build=True)
+
+
+class A2APart(_A2AModel):
     text: str | None = None
     data: dict | None = None
     url: str | None = None
@@ -30,7 +36,7 @@ class A2APart(BaseModel):
     mediaType: str | None = None
 
 
-class A2AMessage(BaseModel):
+class A2AMessage(_A2AModel):
     messageId: str
     role: A2AMessageRole
     parts: list[A2APart]
@@ -40,13 +46,13 @@ class A2AMessage(BaseModel):
     extensions: list[str] | None = None
 
 
-class A2ATaskStatus(BaseModel):
+class A2ATaskStatus(_A2AModel):
     state: A2ATaskState
     timestamp: str | None = None
     message: A2AMessage | None = None
 
 
-class A2AArtifact(BaseModel):
+class A2AArtifact(_A2AModel):
     artifactId: str
     name: str | None = None
     description: str | None = None
@@ -55,7 +61,7 @@ class A2AArtifact(BaseModel):
     extensions: list[str] | None = None
 
 
-class A2ATask(BaseModel):
+class A2ATask(_A2AModel):
     id: str
     contextId: str
     status: A2ATaskStatus
@@ -64,43 +70,43 @@ class A2ATask(BaseModel):
     metadata: dict | None = None
 
 
-class SendMessageConfiguration(BaseModel):
+class SendMessageConfiguration(_A2AModel):
     acceptedOutputModes: list[str] | None = None
     blocking: bool | None = None
     historyLength: int | None = None
     pushNotificationConfig: dict | None = None
 
 
-class SendMessageRequest(BaseModel):
+class SendMessageRequest(_A2AModel):
     message: A2AMessage
     configuration: SendMessageConfiguration | None = None
 
 
-class SendMessageResponse(BaseModel):
+class SendMessageResponse(_A2AModel):
     task: A2ATask | None = None
     message: A2AMessage | None = None
 
 
-class GetTaskRequest(BaseModel):
+class GetTaskRequest(_A2AModel):
     id: str
     historyLength: int | None = None
 
 
-class JSONRPCRequest(BaseModel):
+class JSONRPCRequest(_A2AModel):
     jsonrpc: str = "2.0"
     method: str
     params: dict | None = None
     id: str | int
 
 
-class JSONRPCResponse(BaseModel):
+class JSONRPCResponse(_A2AModel):
     jsonrpc: str = "2.0"
     result: dict | None = None
     error: dict | None = None
     id: str | int | None = None
 
 
-class JSONRPCError(BaseModel):
+class JSONRPCError(_A2AModel):
     code: int
     message: str
     data: dict | None = None
@@ -2,72 +2,166 @@ import uuid
 import secrets
 import hashlib
 import logging
-from datetime import datetime, timezone
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
+import orjson
+from cachetools import TTLCache
+from postgrest.exceptions import APIError
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
 from app.core.supabase_client import get_supabase
 from app.core.signing import get_public_key_hex
 from app.models.schemas import AgentRegisterRequest
 from app.services.reputation import (
-    project_decay, apply_time_decay, compute_endorsement_bonus,
-    compute_certification_tier, clamp_score, BASELINE,
+    project_decay, time_decay_factor, apply_decay_factor, compute_endorsement_bonus,
+    compute_certification_tier, BASELINE,
     TIER_ENDORSEMENT_MULTIPLIER,
 )
 
 logger = logging.getLogger(__name__)
 
+# Short-lived get_a2a_trust() results keyed by agent_id, for high-fanout
+# trust polling. Every path that changes an agent's score must invalidate.
+TRUST_CACHE_TTL = 60
+trust_cache: TTLCache = TTLCache(maxsize=4096, ttl=TRUST_CACHE_TTL)
+
+
+def invalidate_trust_cache(agent_id: str) -> None:
+    trust_cache.pop(agent_id, None)
+
+
+# agent_id -> api_key_hash already checked against the agents table, so
+# chatty webhook/endorse callers skip the ownership lookup for a while.
+OWNERSHIP_CACHE_TTL = 30
+ownership_cache: TTLCache = TTLCache(maxsize=10_000, ttl=OWNERSHIP_CACHE_TTL)
+
+
+def invalidate_ownership_cache(agent_id: str) -> None:
+    ownership_cache.pop(agent_id, None)
+
+
+# Full agents rows for trace scoring, shared across workers through Redis
+# (REDIS_URL). Rows are cached only after record_traces commits them; every
+# other path that writes an agents row (endorsements, deletion, decay) must
+# invalidate.
+AGENT_ROW_CACHE_TTL = 3600
+_agent_row_redis: Redis | None = None
+_agent_row_redis_checked = False
+
+
+def _get_agent_row_redis() -> Redis | None:
+    global _agent_row_redis, _agent_row_redis_checked
+    if not _agent_row_redis_checked:
+        _agent_row_redis_checked = True
+        redis_url = get_settings().redis_url
+        if redis_url:
+            _agent_row_redis = Redis.from_url(
+                redis_url, socket_timeout=0.5, socket_connect_timeout=0.5
+            )
+    return _agent_row_redis
+
+
+def get_cached_agent_row(agent_id: str) -> dict | None:
+    client = _get_agent_row_redis()
+    if client is None:
+        return None
+    try:
+        raw = client.get(f"agent:{agent_id}")
+    except RedisError:
+        logger.warning("Agent row cache read failed for %s", agent_id)
+        return None
+    return orjson.loads(raw) if raw else None
+
+
+def cache_agent_row(agent: dict) -> None:
+    client = _get_agent_row_redis()
+    if client is None:
+        return
+    try:
+        client.setex(f"agent:{agent['id']}", AGENT_ROW_CACHE_TTL, orjson.dumps(agent))
+    except RedisError:
+        logger.warning("Agent row cache write failed for %s", agent["id"])
+        # Never leave the row from before the write behind.
+        invalidate_agent_row(agent["id"])
+
+
+def invalidate_agent_row(agent_id: str) -> None:
+    client = _get_agent_row_redis()
+    if client is None:
+        return
+    try:
+        client.delete(f"agent:{agent_id}")
+    except RedisError:
+        logger.warning("Agent row cache invalidation failed for %s", agent_id)
+
+
+# Fans out independent Supabase reads within one request. Bounded so a
+# burst of detail requests cannot open more than this many extra queries.
+read_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="garl-read")
+
+
+def hash_api_key(api_key: str) -> str:
+    """SHA-256 hex digest stored as agents.api_key_hash.
+
+    Not memoized: a cache would hold plaintext keys for the life of the
+    process, and hashing a short key costs less than the lookup.
+    """
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def api_key_matches(api_key: str, stored_hash: str | None) -> bool:
+    """Constant-time check of api_key against a stored api_key_hash."""
+    return secrets.compare_digest(stored_hash or "", hash_api_key(api_key))
+
 
 def _generate_sovereign_id(agent_uuid: str) -> str:
     """Generate Decentralized Identifier (DID): did:garl:<uuid>"""
     return f"did:garl:{agent_uuid}"
 
 
-def _apply_lazy_decay(agent: dict, db) -> dict:
-    """Apply lazy decay to inactive agents' scores."""
-    last_trace = agent.get("last_trace_at")
-    if not last_trace or agent.get("total_traces", 0) == 0:
-        return agent
+_DECAY_FIELDS = (
+    "trust_score", "score_reliability", "score_speed",
+    "score_cost_efficiency", "score_consistency", "score_security",
+)
+DECAY_IDLE_HOURS = 24
+
 
+def _parse_timestamp(value: str | None) -> datetime | None:
+    if not value:
+        return None
     try:
-        last_dt = datetime.fromisoformat(last_trace.replace("Z", "+00:00"))
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
     except (ValueError, TypeError):
-        return agent
-
-    now = datetime.now(timezone.utc)
-    hours_since = (now - last_dt).total_seconds() / 3600.0
+        return None
 
-    if hours_since < 24:
-        return agent
-
-    fields = [
-        "trust_score", "score_reliability", "score_speed",
-        "score_cost_efficiency", "score_consistency", "score_security",
-    ]
 
+def _decay_updates(agent: dict, hours_since: float, now_iso: str) -> dict:
+    """Decay agent's scores by hours_since in place; returns the changed columns ({} if none)."""
+    if hours_since <= 0:
+        return {}
+    factor = time_decay_factor(hours_since)
     updated = {}
-    changed = False
-    for field in fields:
+    for field in _DECAY_FIELDS:
         old_val = float(agent.get(field) or BASELINE)
-        new_val = apply_time_decay(old_val, hours_since)
+        new_val = apply_decay_factor(old_val, factor)
         if abs(new_val - old_val) > 0.01:
             updated[field] = new_val
             agent[field] = new_val
-            changed = True
 
-    if changed:
-        # Tier update
+    if updated:
         new_tier = compute_certification_tier(
             float(agent.get("trust_score", BASELINE)),
             agent.get("anomaly_flags"),
         )
         updated["certification_tier"] = new_tier
         agent["certification_tier"] = new_tier
-        updated["updated_at"] = now.isoformat()
-        try:
-            db.table("agents").update(updated).eq("id", agent["id"]).execute()
-        except Exception:
-            pass
-
-    return agent
+        updated["decayed_at"] = now_iso
+        updated["updated_at"] = now_iso
+    return updated
 
 
 def register_agent(req: AgentRegisterRequest, developer_id: str | None = None) -> dict:
@@ -80,7 +174,7 @@ def register_agent(req: AgentRegisterRequest, developer_id: str | None = None) -
 
     agent_id = str(uuid.uuid4())
     api_key = f"garl_{secrets.token_urlsafe(32)}"
-    api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+    api_key_hash = hash_api_key(api_key)
     sovereign_id = _generate_sovereign_id(agent_id)
     now = datetime.now(timezone.utc).isoformat()
 
@@ -125,15 +219,29 @@ def register_agent(req: AgentRegisterRequest, developer_id: str | None = None) -
     return response
 
 
+# Every agents column except api_key_hash, so public profile reads never
+# pull the credential hash over the wire (the pops below stay as a guard).
+_PUBLIC_AGENT_COLUMNS = (
+    "id, name, description, framework, category, trust_score, total_traces, "
+    "success_count, success_rate, consecutive_successes, "
+    "score_reliability, score_security, score_speed, score_cost_efficiency, score_consistency, "
+    "ema_reliability, ema_security, ema_speed, ema_cost_efficiency, "
+    "total_cost_usd, avg_duration_ms, anomaly_flags, active_anomaly_count, "
+    "endorsement_score, endorsement_count, "
+    "sovereign_id, certification_tier, permissions_declared, security_events, "
+    "is_deleted, is_sandbox, deleted_at, last_trace_at, homepage_url, developer_id, "
+    "created_at, updated_at"
+)
+
+
 def get_agent(agent_id: str) -> dict | None:
     db = get_supabase()
-    res = db.table("agents").select("*").eq("id", agent_id).eq("is_deleted", False).execute()
+    res = db.table("agents").select(_PUBLIC_AGENT_COLUMNS).eq("id", agent_id).eq("is_deleted", False).execute()
     if not res.data:
         return None
     agent = res.data[0]
     agent.pop("api_key", None)
     agent.pop("api_key_hash", None)
-    agent = _apply_lazy_decay(agent, db)
     return agent
 
 
@@ -141,33 +249,37 @@ def get_agent_detail(agent_id: str) -> dict | None:
     """Agent detail: profile + last 50 traces + 100 history entries + decay projection."""
     db = get_supabase()
 
-    agent_res = db.table("agents").select("*").eq("id", agent_id).eq("is_deleted", False).execute()
-    if not agent_res.data:
-        return None
-
-    agent = agent_res.data[0]
-    agent.pop("api_key", None)
-    agent.pop("api_key_hash", None)
-    agent = _apply_lazy_decay(agent, db)
-
-    traces_res = (
+    # The three reads only need agent_id, so they run concurrently on the
+    # shared pool: one round-trip of latency instead of three.
+    agent_future = read_pool.submit(
+        db.table("agents").select(_PUBLIC_AGENT_COLUMNS).eq("id", agent_id).eq("is_deleted", False).execute
+    )
+    traces_future = read_pool.submit(
         db.table("traces")
         .select("*")
         .eq("agent_id", agent_id)
         .order("created_at", desc=True)
         .limit(50)
-        .execute()
+        .execute
     )
-
-    history_res = (
+    history_future = read_pool.submit(
         db.table("reputation_history")
         .select("*")
         .eq("agent_id", agent_id)
         .order("created_at", desc=True)
         .limit(100)
-        .execute()
+        .execute
     )
 
+    agent_res = agent_future.result()
+    traces_res = traces_future.result()
+    history_res = history_future.result()
+    if not agent_res.data:
+        return None
+
+    agent = agent_res.data[0]
+    agent.pop("api_key", None)
+    agent.pop("api_key_hash", None)
     score = float(agent.get("trust_score", BASELINE))
     decay_projection = project_decay(score, [7, 30, 60, 90])
 
@@ -179,7 +291,17 @@ def get_agent_detail(agent_id: str) -> dict | None:
     }
 
 
-def get_leaderboard(category: str | None = None, limit: int = 50, offset: int = 0) -> list[dict]:
+def get_leaderboard(
+    category: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+    after: tuple[int, float, str] | None = None,
+) -> list[dict]:
+    """Ranked agents by (trust_score DESC, id DESC).
+
+    after is the (rank, trust_score, id) of the last entry already seen;
+    when given, the page is fetched by keyset instead of OFFSET.
+    """
     db = get_supabase()
     query = db.table("agents").select(
         "id, name, framework, category, trust_score, total_traces, success_rate, "
@@ -194,38 +316,59 @@ def get_leaderboard(category: str | None = None, limit: int = 50, offset: int =
     query = (
         query.gt("total_traces", 0)
         .order("trust_score", desc=True)
-        .range(offset, offset + limit - 1)
+        .order("id", desc=True)
     )
+    if after is not None:
+        last_rank, last_score, last_id = after
+        query = query.or_(
+            f"trust_score.lt.{last_score},and(trust_score.eq.{last_score},id.lt.{last_id})"
+        ).limit(limit)
+        first_rank = last_rank + 1
+    else:
+        query = query.range(offset, offset + limit - 1)
+        first_rank = offset + 1
     res = query.execute()
 
     rows = res.data or []
-    rows = batch_apply_decay_for_leaderboard(rows, db)
 
     entries = []
-    for i, row in enumerate(rows, offset + 1):
+    for i, row in enumerate(rows, first_rank):
         entries.append({**row, "rank": i})
     return entries
 
 
+def iter_leaderboard(category: str | None = None, page_size: int = 1000) -> Iterator[dict]:
+    """Yield the whole leaderboard in rank order, one keyset page at a time."""
+    after = None
+    while True:
+        page = get_leaderboard(category, page_size, 0, after)
+        yield from page
+        if len(page) < page_size:
+            return
+        # Rows carry the stored trust_score the page was sorted by.
+        last = page[-1]
+        after = (last["rank"], float(last["trust_score"]), last["id"])
+
+
 def get_a2a_trust(agent_id: str) -> dict | None:
     """Agent-to-Agent trust check: risk level, recommendation, and 5 dimensions."""
     db = get_supabase()
     res = db.table("agents").select(
         "id, name, trust_score, success_rate, total_traces, "
         "score_reliability, score_speed, score_cost_efficiency, score_consistency, "
-        "score_security, anomaly_flags, last_trace_at, framework, category, "
+        "score_security, anomaly_flags, active_anomaly_count, last_trace_at, framework, category, "
         "sovereign_id, certification_tier"
     ).eq("id", agent_id).eq("is_deleted", False).execute()
 
     if not res.data:
         return None
 
-    agent = _apply_lazy_decay(res.data[0], db)
+    agent = res.data[0]
     score = float(agent["trust_score"])
     traces = int(agent["total_traces"])
     verified = traces >= 10
     anomalies = agent.get("anomaly_flags") or []
-    has_recent_anomaly = len([a for a in anomalies if not a.get("archived")]) > 0
+    has_recent_anomaly = (agent.get("active_anomaly_count") or 0) > 0
 
     if score >= 75 and verified and not has_recent_anomaly:
         risk_level = "low"
@@ -273,7 +416,12 @@ def get_a2a_trust(agent_id: str) -> dict | None:
 def get_agent_card(agent_id: str) -> dict | None:
     """Agent Card: DID, tier, and 5-dimensional trust profile."""
     db = get_supabase()
-    res = db.table("agents").select("*").eq("id", agent_id).eq("is_deleted", False).execute()
+    res = db.table("agents").select(
+        "id, name, description, category, framework, homepage_url, created_at, "
+        "sovereign_id, certification_tier, trust_score, success_rate, total_traces, "
+        "score_reliability, score_security, score_speed, score_cost_efficiency, "
+        "score_consistency, last_trace_at"
+    ).eq("id", agent_id).eq("is_deleted", False).execute()
     if not res.data:
         return None
 
@@ -325,16 +473,26 @@ def get_agent_card(agent_id: str) -> dict | None:
 
 
 def compare_agents(agent_ids: list[str]) -> list[dict]:
+    agent_ids = agent_ids[:10]
+    if not agent_ids:
+        return []
     db = get_supabase()
+    res = db.table("agents").select(
+        "id, name, framework, category, trust_score, total_traces, success_rate, "
+        "score_reliability, score_speed, score_cost_efficiency, score_consistency, "
+        "score_security, avg_duration_ms, total_cost_usd, sovereign_id, certification_tier"
+    ).in_("id", list(dict.fromkeys(agent_ids))).eq("is_deleted", False).execute()
+    # One round-trip; results keep the caller's order. Postgres returns the
+    # canonical lowercase form of ids given as UPPER, {braced}, etc.
+    by_id = {row["id"]: row for row in res.data or []}
     results = []
-    for aid in agent_ids[:10]:
-        res = db.table("agents").select(
-            "id, name, framework, category, trust_score, total_traces, success_rate, "
-            "score_reliability, score_speed, score_cost_efficiency, score_consistency, "
-            "score_security, avg_duration_ms, total_cost_usd, sovereign_id, certification_tier"
-        ).eq("id", aid).eq("is_deleted", False).execute()
-        if res.data:
-            results.append(res.data[0])
+    for aid in agent_ids:
+        try:
+            aid = str(uuid.UUID(aid))
+        except (ValueError, AttributeError, TypeError):
+            pass
+        if aid in by_id:
+            results.append(by_id[aid])
     return results
 
 
@@ -351,25 +509,13 @@ def get_recent_traces(limit: int = 20) -> list[dict]:
 
 
 def get_stats() -> dict:
+    """Public agent/trace counts and the top agent, via get_agent_stats() in one round-trip."""
     db = get_supabase()
-    agents_res = db.table("agents").select("id", count="exact").eq("is_deleted", False).eq("is_sandbox", False).execute()
-    traces_res = db.table("traces").select("id", count="exact").execute()
-
-    top_agent_res = (
-        db.table("agents")
-        .select("name, trust_score, certification_tier")
-        .eq("is_deleted", False)
-        .eq("is_sandbox", False)
-        .gt("total_traces", 0)
-        .order("trust_score", desc=True)
-        .limit(1)
-        .execute()
-    )
-
+    stats = db.rpc("get_agent_stats").execute().data or {}
     return {
-        "total_agents": agents_res.count or 0,
-        "total_traces": traces_res.count or 0,
-        "top_agent": top_agent_res.data[0] if top_agent_res.data else None,
+        "total_agents": stats.get("total_agents") or 0,
+        "total_traces": stats.get("total_traces") or 0,
+        "top_agent": stats.get("top_agent"),
     }
 
 
@@ -403,13 +549,16 @@ def search_agents(query: str = "", category: str | None = None, limit: int = 10)
 
 # --- Smart Delegation & Routing ---
 
+_TIER_ORDER = ("bronze", "silver", "gold", "enterprise")
+# min_tier -> every tier at or above it; unknown values fall back to silver.
+_TIERS_AT_OR_ABOVE = {tier: _TIER_ORDER[i:] for i, tier in enumerate(_TIER_ORDER)}
+
+
 def route_agents(category: str, min_tier: str = "silver", limit: int = 3) -> dict:
     """Recommend the most trusted agents filtered by category and minimum tier."""
     db = get_supabase()
 
-    tier_order = ["bronze", "silver", "gold", "enterprise"]
-    min_tier_idx = tier_order.index(min_tier) if min_tier in tier_order else 1
-    allowed_tiers = tier_order[min_tier_idx:]
+    allowed_tiers = _TIERS_AT_OR_ABOVE.get(min_tier) or _TIERS_AT_OR_ABOVE["silver"]
 
     query = (
         db.table("agents")
@@ -524,33 +673,19 @@ def create_endorsement(endorser_id: str, target_id: str, context: str, api_key:
     """A2A endorsement: Sybil protection with tier-based weighting."""
     db = get_supabase()
 
-    endorser_res = db.table("agents").select("*").eq("id", endorser_id).eq("is_deleted", False).execute()
+    endorser_res = db.table("agents").select(
+        "id, api_key_hash, trust_score, total_traces, certification_tier"
+    ).eq("id", endorser_id).eq("is_deleted", False).execute()
     if not endorser_res.data:
         raise ValueError("Endorser agent not found")
     endorser = endorser_res.data[0]
 
-    api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
-    if endorser.get("api_key_hash") != api_key_hash:
+    if not api_key_matches(api_key, endorser.get("api_key_hash")):
         raise PermissionError("API key does not belong to endorser agent")
 
     if endorser_id == target_id:
         raise ValueError("Self-endorsement is not allowed")
 
-    target_res = db.table("agents").select("*").eq("id", target_id).eq("is_deleted", False).execute()
-    if not target_res.data:
-        raise ValueError("Target agent not found")
-    target = target_res.data[0]
-
-    existing = (
-        db.table("endorsements")
-        .select("id")
-        .eq("endorser_id", endorser_id)
-        .eq("target_id", target_id)
-        .execute()
-    )
-    if existing.data:
-        raise ValueError("Endorsement already exists between these agents")
-
     endorser_tier = endorser.get("certification_tier", "bronze")
 
     bonus = compute_endorsement_bonus(
@@ -564,35 +699,29 @@ def create_endorsement(endorser_id: str, target_id: str, context: str, api_key:
     endorsement_id = str(uuid.uuid4())
     now = datetime.now(timezone.utc).isoformat()
 
-    db.table("endorsements").insert({
-        "id": endorsement_id,
-        "endorser_id": endorser_id,
-        "target_id": target_id,
-        "endorser_score": float(endorser.get("trust_score", BASELINE)),
-        "endorser_traces": int(endorser.get("total_traces", 0)),
-        "bonus_applied": bonus,
-        "endorser_tier": endorser_tier,
-        "tier_multiplier": tier_multiplier,
-        "context": context[:500] if context else "",
-        "created_at": now,
-    }).execute()
-
-    current_endorsement_score = float(target.get("endorsement_score", 0))
-    current_endorsement_count = int(target.get("endorsement_count", 0))
-    new_endorsement_score = round(current_endorsement_score + bonus, 4)
-    new_endorsement_count = current_endorsement_count + 1
-
-    current_trust = float(target.get("trust_score", BASELINE))
-    new_trust = clamp_score(current_trust + bonus)
-    new_tier = compute_certification_tier(new_trust, target.get("anomaly_flags"))
-
-    db.table("agents").update({
-        "endorsement_score": new_endorsement_score,
-        "endorsement_count": new_endorsement_count,
-        "trust_score": new_trust,
-        "certification_tier": new_tier,
-        "updated_at": now,
-    }).eq("id", target_id).execute()
+    # apply_endorsement() locks the target, inserts the endorsement and
+    # applies the bonus and tier in one transaction (no lost updates).
+    try:
+        applied = db.rpc("apply_endorsement", {"endorsement": {
+            "id": endorsement_id,
+            "endorser_id": endorser_id,
+            "target_id": target_id,
+            "endorser_score": float(endorser.get("trust_score", BASELINE)),
+            "endorser_traces": int(endorser.get("total_traces", 0)),
+            "bonus_applied": bonus,
+            "endorser_tier": endorser_tier,
+            "tier_multiplier": tier_multiplier,
+            "context": context[:500] if context else "",
+            "created_at": now,
+        }}).execute().data
+    except APIError as e:
+        if e.code == "P0002":
+            raise ValueError("Target agent not found")
+        if e.code == "23505":
+            raise ValueError("Endorsement already exists between these agents")
+        raise
+    invalidate_trust_cache(target_id)
+    invalidate_agent_row(target_id)
 
     return {
         "endorsement_id": endorsement_id,
@@ -601,8 +730,8 @@ def create_endorsement(endorser_id: str, target_id: str, context: str, api_key:
         "bonus_applied": bonus,
         "endorser_tier": endorser_tier,
         "tier_multiplier": tier_multiplier,
-        "target_new_trust_score": new_trust,
-        "target_new_tier": new_tier,
+        "target_new_trust_score": float(applied["trust_score"]),
+        "target_new_tier": applied["certification_tier"],
         "endorser_credibility": {
             "score": float(endorser.get("trust_score", BASELINE)),
             "traces": int(endorser.get("total_traces", 0)),
@@ -612,28 +741,61 @@ def create_endorsement(endorser_id: str, target_id: str, context: str, api_key:
     }
 
 
-def get_endorsements(agent_id: str) -> dict:
+def get_endorsements(
+    agent_id: str, limit: int = 100, cursor: tuple[str, str] | None = None
+) -> dict:
+    """Endorsements received and given, newest first by (created_at, id).
+
+    Both directions come from one stream, so limit bounds the combined page;
+    pass next_cursor back as cursor to continue it. The bonus total always
+    covers every row.
+    """
     db = get_supabase()
 
-    received = (
-        db.table("endorsements")
-        .select("id, endorser_id, endorser_score, endorser_traces, bonus_applied, endorser_tier, tier_multiplier, context, created_at")
-        .eq("target_id", agent_id)
-        .order("created_at", desc=True)
-        .execute()
+    # One query for both directions; partition by which side matches.
+    # PostgREST returns canonical lowercase UUIDs. The bonus total is a
+    # DB-side aggregate, fetched concurrently with the list.
+    agent_id = str(uuid.UUID(agent_id))
+    bonus_future = read_pool.submit(
+        db.rpc("endorsement_bonus_total", {"aid": agent_id}).execute
     )
-    given = (
+    row_filter = f"target_id.eq.{agent_id},endorser_id.eq.{agent_id}"
+    if cursor is not None:
+        last_created, last_id = cursor
+        row_filter = (
+            f"and(or({row_filter}),"
+            f'or(created_at.lt."{last_created}",and(created_at.eq."{last_created}",id.lt.{last_id})))'
+        )
+    res = (
         db.table("endorsements")
-        .select("id, target_id, endorser_score, endorser_traces, bonus_applied, endorser_tier, tier_multiplier, context, created_at")
-        .eq("endorser_id", agent_id)
+        .select(
+            "id, endorser_id, target_id, endorser_score, endorser_traces, bonus_applied, "
+            "endorser_tier, tier_multiplier, context, created_at"
+        )
+        .or_(row_filter)
         .order("created_at", desc=True)
+        .order("id", desc=True)
+        .limit(limit)
         .execute()
     )
+    rows = res.data or []
+    next_cursor = f"{rows[-1]['created_at']},{rows[-1]['id']}" if len(rows) == limit else None
+
+    received = []
+    given = []
+    for e in rows:
+        if e["target_id"] == agent_id:
+            del e["target_id"]
+            received.append(e)
+        else:
+            del e["endorser_id"]
+            given.append(e)
 
     return {
-        "received": received.data or [],
-        "given": given.data or [],
-        "total_endorsement_bonus": round(sum(e["bonus_applied"] for e in (received.data or [])), 4),
+        "received": received,
+        "given": given,
+        "total_endorsement_bonus": round(float(bonus_future.result().data or 0), 4),
+        "next_cursor": next_cursor,
     }
 
 
@@ -648,8 +810,7 @@ def soft_delete_agent(agent_id: str, api_key: str) -> dict:
         raise ValueError("Agent not found")
 
     agent = agent_res.data[0]
-    api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
-    if agent.get("api_key_hash") != api_key_hash:
+    if not api_key_matches(api_key, agent.get("api_key_hash")):
         raise PermissionError("Invalid API key")
 
     now = datetime.now(timezone.utc).isoformat()
@@ -658,6 +819,9 @@ def soft_delete_agent(agent_id: str, api_key: str) -> dict:
         "deleted_at": now,
         "updated_at": now,
     }).eq("id", agent_id).execute()
+    invalidate_trust_cache(agent_id)
+    invalidate_ownership_cache(agent_id)
+    invalidate_agent_row(agent_id)
 
     return {
         "agent_id": agent_id,
@@ -676,8 +840,7 @@ def anonymize_agent(agent_id: str, api_key: str) -> dict:
         raise ValueError("Agent not found")
 
     agent = agent_res.data[0]
-    api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
-    if agent.get("api_key_hash") != api_key_hash:
+    if not api_key_matches(api_key, agent.get("api_key_hash")):
         raise PermissionError("Invalid API key")
 
     # Anonymize personal data
@@ -693,6 +856,9 @@ def anonymize_agent(agent_id: str, api_key: str) -> dict:
         "deleted_at": now,
         "updated_at": now,
     }).eq("id", agent_id).execute()
+    invalidate_trust_cache(agent_id)
+    invalidate_ownership_cache(agent_id)
+    invalidate_agent_row(agent_id)
 
     return {
         "agent_id": agent_id,
@@ -708,12 +874,29 @@ def get_compliance_report(agent_id: str) -> dict | None:
     """Enterprise compliance report: SLA, anomaly history, security risks."""
     db = get_supabase()
 
-    agent_res = db.table("agents").select("*").eq("id", agent_id).eq("is_deleted", False).execute()
+    # Endorsements are summarised (counts + bonus, five most recent) so the
+    # report stays the same size however popular the agent is.
+    summary_future = read_pool.submit(
+        db.rpc("get_endorsement_summary", {"aid": agent_id}).execute
+    )
+    recent_future = read_pool.submit(
+        db.table("endorsements")
+        .select("id, endorser_id, endorser_tier, bonus_applied, context, created_at")
+        .eq("target_id", agent_id)
+        .order("created_at", desc=True)
+        .limit(5)
+        .execute
+    )
+    agent_res = db.table("agents").select(
+        "id, name, sovereign_id, certification_tier, trust_score, total_traces, success_rate, "
+        "avg_duration_ms, score_reliability, score_security, score_speed, "
+        "score_cost_efficiency, score_consistency, anomaly_flags, permissions_declared, "
+        "created_at, last_trace_at"
+    ).eq("id", agent_id).eq("is_deleted", False).execute()
     if not agent_res.data:
         return None
 
     agent = agent_res.data[0]
-    agent = _apply_lazy_decay(agent, db)
 
     # SLA compliance metrics
     total = int(agent.get("total_traces", 0))
@@ -756,7 +939,13 @@ def get_compliance_report(agent_id: str) -> dict | None:
         })
 
     # Endorsement summary
-    endorsements = get_endorsements(agent_id)
+    summary = summary_future.result().data or {}
+    endorsements = {
+        "received_count": int(summary.get("received_count") or 0),
+        "given_count": int(summary.get("given_count") or 0),
+        "total_endorsement_bonus": round(float(summary.get("total_bonus") or 0), 4),
+        "recent_received": recent_future.result().data or [],
+    }
 
     return {
         "agent_id": agent["id"],
@@ -786,53 +975,75 @@ def get_compliance_report(agent_id: str) -> dict | None:
     }
 
 
-def batch_apply_decay_for_leaderboard(agents: list[dict], db) -> list[dict]:
-    """Batch decay calculation for leaderboard."""
-    now = datetime.now(timezone.utc)
-    updates_batch = []
+def _write_decay_updates(db, batch: list[dict], cutoff: str) -> int | None:
+    """Write a page of decay updates in one round-trip via apply_agent_decay().
 
-    for agent in agents:
-        last_trace = agent.get("last_trace_at")
-        if not last_trace or agent.get("total_traces", 0) == 0:
-            continue
+    A plain upsert would need every NOT NULL column (name, sovereign_id,
+    api_key_hash) in each row; the SQL function UPDATEs only the decay
+    columns and keeps any a row leaves out. Rows with a trace after cutoff
+    are skipped, so a concurrent record_traces is never overwritten.
+    Returns the number of rows updated, or None if the write failed.
+    """
+    if not batch:
+        return 0
+    try:
+        res = db.rpc("apply_agent_decay", {"updates": batch, "cutoff": cutoff}).execute()
+    except Exception:
+        logger.warning("Failed decay update for %d agents", len(batch))
+        return None
+    return res.data or 0
 
-        try:
-            last_dt = datetime.fromisoformat(last_trace.replace("Z", "+00:00"))
-        except (ValueError, TypeError):
-            continue
-
-        hours_since = (now - last_dt).total_seconds() / 3600.0
-        if hours_since < 24:
-            continue
-
-        fields = [
-            "trust_score", "score_reliability", "score_speed",
-            "score_cost_efficiency", "score_consistency", "score_security",
-        ]
-        updated = {}
-        changed = False
-        for field in fields:
-            old_val = float(agent.get(field) or BASELINE)
-            new_val = apply_time_decay(old_val, hours_since)
-            if abs(new_val - old_val) > 0.01:
-                updated[field] = new_val
-                agent[field] = new_val
-                changed = True
-
-        if changed:
-            new_tier = compute_certification_tier(
-                float(agent.get("trust_score", BASELINE)),
-                agent.get("anomaly_flags"),
-            )
-            updated["certification_tier"] = new_tier
-            agent["certification_tier"] = new_tier
-            updated["updated_at"] = now.isoformat()
-            updates_batch.append((agent["id"], updated))
 
-    for agent_id, updates in updates_batch:
-        try:
-            db.table("agents").update(updates).eq("id", agent_id).execute()
-        except Exception:
-            logger.warning("Failed batch decay update for agent %s", agent_id)
+def decay_stale_agents(page_size: int = 500) -> int:
+    """Apply time decay to every agent idle for DECAY_IDLE_HOURS+; returns rows updated.
 
-    return agents
+    Run periodically by app.jobs.decay_worker, so reads serve stored scores.
+    Each pass decays by the hours since the agent's last trace or last decay
+    (decayed_at), so repeated passes compound to the same score a single
+    decay over the whole idle period would give. Endorsements and profile
+    edits move updated_at but not decayed_at, so they never reset it.
+    """
+    db = get_supabase()
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    cutoff = (now - timedelta(hours=DECAY_IDLE_HOURS)).isoformat()
+    columns = "id, " + ", ".join(_DECAY_FIELDS) + ", anomaly_flags, last_trace_at, decayed_at"
+
+    updated_count = 0
+    last_id = None
+    while True:
+        query = (
+            db.table("agents").select(columns)
+            .eq("is_deleted", False)
+            .gt("total_traces", 0)
+            .lt("last_trace_at", cutoff)
+        )
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(page_size).execute().data or []
+
+        updates_batch = []
+        for agent in rows:
+            stamps = [
+                ts for ts in (
+                    _parse_timestamp(agent.get("last_trace_at")),
+                    _parse_timestamp(agent.get("decayed_at")),
+                ) if ts is not None
+            ]
+            if not stamps:
+                continue
+            hours_since = (now - max(stamps)).total_seconds() / 3600.0
+            updates = _decay_updates(agent, hours_since, now_iso)
+            if updates:
+                updates_batch.append({"id": agent["id"], **updates})
+
+        written = _write_decay_updates(db, updates_batch, cutoff)
+        if written is not None:
+            for row in updates_batch:
+                invalidate_trust_cache(row["id"])
+                invalidate_agent_row(row["id"])
+            updated_count += written
+
+        if len(rows) < page_size:
+            return updated_count
+        last_id = rows[-1]["id"]
@@ -90,13 +90,10 @@ def _ema_update(ema_old: float, observation: float, alpha: float = EMA_ALPHA) ->
 
 def compute_certification_tier(trust_score: float, anomaly_flags: list[dict] | None = None) -> str:
     """Calculate certification tier based on score and anomaly status."""
-    active_anomalies = [
-        f for f in (anomaly_flags or [])
-        if not f.get("archived")
-    ]
-
     # Enterprise tier: zero active anomalies required
-    if trust_score >= TIER_THRESHOLDS["enterprise"] and len(active_anomalies) == 0:
+    if trust_score >= TIER_THRESHOLDS["enterprise"] and all(
+        f.get("archived") for f in (anomaly_flags or [])
+    ):
         return "enterprise"
     elif trust_score >= TIER_THRESHOLDS["gold"]:
         return "gold"
@@ -250,13 +247,27 @@ def compute_cost_score(
     return round(clamp_score(blended), 2), new_ema
 
 
+_CONSISTENCY_EDGES = (0.5, 1.5, 3.0)
+
+
+def _sample_stdev(values: list[float]) -> float:
+    """Sample standard deviation in float arithmetic (n >= 2)."""
+    n = len(values)
+    mean = math.fsum(values) / n
+    return math.sqrt(math.fsum((v - mean) ** 2 for v in values) / (n - 1))
+
+
 def compute_consistency_score(
     current: float, recent_deltas: list[float]
 ) -> float:
     if len(recent_deltas) < 3:
         return current
 
-    stdev = statistics.stdev(recent_deltas) if len(recent_deltas) > 1 else 0
+    stdev = _sample_stdev(recent_deltas)
+    # Float rounding only matters right at a band edge; settle those with
+    # the exact (Fraction-based) statistics.stdev.
+    if any(abs(stdev - edge) < 1e-9 for edge in _CONSISTENCY_EDGES):
+        stdev = statistics.stdev(recent_deltas)
 
     if stdev < 0.5:
         delta = 1.0
@@ -279,15 +290,24 @@ def compute_composite_score(dimensions: dict[str, float]) -> float:
     return round(clamp_score(total), 2)
 
 
+def time_decay_factor(hours_since_last: float) -> float:
+    """Fraction of the distance to baseline lost after hours_since_last (0.1% per day)."""
+    days = hours_since_last / 24.0
+    decay_rate = 0.001
+    return 1 - math.pow(1 - decay_rate, days)
+
+
+def apply_decay_factor(score: float, factor: float) -> float:
+    """apply_time_decay with a precomputed time_decay_factor (for batches)."""
+    # clamp_score already rounds to 2 places and the bounds are whole numbers.
+    return clamp_score(score - (score - BASELINE) * factor)
+
+
 def apply_time_decay(score: float, hours_since_last: float) -> float:
     """Score decay: pulled toward baseline at 0.1% per day."""
     if hours_since_last <= 0:
         return score
-
-    days = hours_since_last / 24.0
-    decay_rate = 0.001
-    decay = (score - BASELINE) * (1 - math.pow(1 - decay_rate, days))
-    return round(clamp_score(score - decay), 2)
+    return apply_decay_factor(score, time_decay_factor(hours_since_last))
 
 
 def detect_anomalies(
@@ -1,16 +1,28 @@
 import uuid
+import asyncio
 import hashlib
 import hmac
 import json
-import time
+import math
 import logging
+import queue
 import threading
 from datetime import datetime, timezone
 
 import httpx
+from cachetools import TTLCache
+from postgrest.exceptions import APIError
 
 from app.core.supabase_client import get_supabase
 from app.core.signing import sign_trace
+from app.services.agents import (
+    read_pool,
+    api_key_matches,
+    invalidate_trust_cache,
+    get_cached_agent_row,
+    cache_agent_row,
+    invalidate_agent_row,
+)
 from app.services.reputation import (
     compute_reliability_delta_ema,
     compute_security_score,
@@ -32,28 +44,87 @@ logger = logging.getLogger(__name__)
 MAX_WEBHOOK_RETRIES = 3
 
 
-def _compute_trace_hash(trace_data: dict) -> str:
-    canonical = json.dumps(trace_data, sort_keys=True, separators=(",", ":"), default=str)
-    return hashlib.sha256(canonical.encode()).hexdigest()
+_TRACE_HASH_KEYS = frozenset({
+    "agent_id", "category", "cost_usd", "duration_ms", "status",
+    "task_description", "timestamp", "token_count", "trace_id",
+})
+_encode_json_str = json.encoder.encode_basestring_ascii
 
 
-def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
-    """Trace submission: 5-dimensional scoring, tier calculation, security analysis."""
-    db = get_supabase()
+def _is_plain_number(value) -> bool:
+    return type(value) is int or (type(value) is float and math.isfinite(value))
+
+
+def _canonical_trace_bytes(trace_data: dict) -> bytes | None:
+    """The json.dumps(sort_keys=True) bytes of a trace_raw dict, built directly.
+
+    Keys, order and escaping are fixed, so this skips the generic encoder.
+    Returns None for anything else (other keys, non-str text, bools,
+    non-finite floats) so the caller falls back to json.dumps.
+    """
+    if trace_data.keys() != _TRACE_HASH_KEYS:
+        return None
+    t = trace_data
+    for key in ("agent_id", "category", "status", "task_description", "timestamp", "trace_id"):
+        if type(t[key]) is not str:
+            return None
+    for key in ("cost_usd", "duration_ms", "token_count"):
+        if not _is_plain_number(t[key]):
+            return None
+    e = _encode_json_str
+    return (
+        f'{{"agent_id":{e(t["agent_id"])},"category":{e(t["category"])},'
+        f'"cost_usd":{t["cost_usd"]!r},"duration_ms":{t["duration_ms"]!r},'
+        f'"status":{e(t["status"])},"task_description":{e(t["task_description"])},'
+        f'"timestamp":{e(t["timestamp"])},"token_count":{t["token_count"]!r},'
+        f'"trace_id":{e(t["trace_id"])}}}'
+    ).encode()
+
+
+def _compute_trace_hash(trace_data: dict) -> str:
+    canonical = _canonical_trace_bytes(trace_data)
+    if canonical is None:
+        canonical = json.dumps(trace_data, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return hashlib.sha256(canonical).hexdigest()
 
-    agent_res = db.table("agents").select("*").eq("id", req.agent_id).execute()
-    if not agent_res.data:
-        raise ValueError("Agent not found")
 
-    agent = agent_res.data[0]
+def _load_agent_for_write(db, agent_id: str, api_key: str) -> dict:
+    """Fetch the agent row and check it is active and owned by api_key."""
+    agent = get_cached_agent_row(agent_id)
+    if agent is None:
+        agent_res = db.table("agents").select("*").eq("id", agent_id).execute()
+        if not agent_res.data:
+            raise ValueError("Agent not found")
+        agent = agent_res.data[0]
 
     if agent.get("is_deleted"):
         raise PermissionError("Agent has been deactivated")
 
-    api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
-    if agent.get("api_key_hash") != api_key_hash:
+    if not api_key_matches(api_key, agent.get("api_key_hash")):
         raise PermissionError("Invalid API key for this agent")
 
+    return agent
+
+
+def _fetch_recent_deltas(db, agent_id: str) -> list[float]:
+    """Last 20 trust deltas for the agent, newest first."""
+    recent_history = (
+        db.table("reputation_history")
+        .select("trust_delta")
+        .eq("agent_id", agent_id)
+        .order("created_at", desc=True)
+        .limit(20)
+        .execute()
+    )
+    return [float(h["trust_delta"]) for h in (recent_history.data or [])]
+
+
+def _score_trace(agent: dict, req: TraceSubmitRequest, recent_deltas: list[float]) -> dict:
+    """Score one trace against the agent's current state without touching the DB.
+
+    Returns the rows to write (trace_row, agent_update, history_row), the
+    webhook events to fire and the API result.
+    """
     total_traces = int(agent["total_traces"])
     successes = int(agent["success_count"])
     consecutive = int(agent.get("consecutive_successes", 0))
@@ -104,17 +175,7 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
         cst_current, ema_cst, cost, req.category.value, total_traces
     )
 
-    recent_history = (
-        db.table("reputation_history")
-        .select("trust_delta")
-        .eq("agent_id", req.agent_id)
-        .order("created_at", desc=True)
-        .limit(20)
-        .execute()
-    )
-    recent_deltas = [float(h["trust_delta"]) for h in (recent_history.data or [])]
-    recent_deltas.append(rel_delta)
-    new_consistency = compute_consistency_score(con_current, recent_deltas)
+    new_consistency = compute_consistency_score(con_current, [*recent_deltas, rel_delta])
 
     dimensions = {
         "reliability": new_reliability,
@@ -127,10 +188,6 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
 
     trust_delta = rel_delta
 
-    # Certification tier update
-    anomaly_flags_current = agent.get("anomaly_flags") or []
-    new_tier = compute_certification_tier(new_composite, anomaly_flags_current)
-
     # --- PII masking ---
     input_summary = req.input_summary
     output_summary = req.output_summary
@@ -143,13 +200,14 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
         pii_masked = True
 
     # --- Anomaly detection ---
+    anomaly_flags_current = agent.get("anomaly_flags") or []
     anomalies = detect_anomalies(agent, req.status.value, req.duration_ms, cost)
     if anomalies:
         all_flags = (anomaly_flags_current + anomalies)[-10:]
     else:
         all_flags = auto_clear_anomalies(anomaly_flags_current, consecutive)
 
-    # Recalculate tier after anomalies
+    # Certification tier update
     new_tier = compute_certification_tier(new_composite, all_flags)
 
     # --- Hash and signing ---
@@ -191,7 +249,7 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
     if req.security_context:
         trace_metadata["security_context"] = req.security_context
 
-    db.table("traces").insert({
+    trace_row = {
         "id": trace_id,
         "agent_id": req.agent_id,
         "task_description": req.task_description,
@@ -210,7 +268,7 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
         "trace_hash": trace_hash,
         "proof_of_result": req.proof_of_result,
         "created_at": now,
-    }).execute()
+    }
 
     # --- Agent update ---
     prev_total_cost = float(agent.get("total_cost_usd", 0) or 0)
@@ -218,7 +276,7 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
     new_total_cost = prev_total_cost + cost
     new_avg_dur = int(((prev_avg_dur * (total_traces - 1)) + req.duration_ms) / total_traces)
 
-    db.table("agents").update({
+    agent_update = {
         "trust_score": new_composite,
         "total_traces": total_traces,
         "success_count": successes,
@@ -239,10 +297,10 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
         "certification_tier": new_tier,
         "last_trace_at": now,
         "updated_at": now,
-    }).eq("id", req.agent_id).execute()
+    }
 
     # --- Reputation history ---
-    db.table("reputation_history").insert({
+    history_row = {
         "id": str(uuid.uuid4()),
         "agent_id": req.agent_id,
         "trust_score": new_composite,
@@ -254,10 +312,10 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
         "score_consistency": new_consistency,
         "score_security": new_security,
         "created_at": now,
-    }).execute()
+    }
 
     # --- Webhook notifications ---
-    _fire_webhooks_with_retry(req.agent_id, {
+    events = [{
         "event": "trace_recorded",
         "agent_id": req.agent_id,
         "trace_id": trace_id,
@@ -268,12 +326,12 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
         "dimensions": dimensions,
         "anomalies": anomalies if anomalies else None,
         "timestamp": now,
-    })
+    }]
 
     score_before = float(agent.get("trust_score", BASELINE))
     score_change_abs = abs(new_composite - score_before)
     if score_change_abs >= 2.0:
-        _fire_webhooks_with_retry(req.agent_id, {
+        events.append({
             "event": "score_change",
             "agent_id": req.agent_id,
             "trace_id": trace_id,
@@ -286,7 +344,7 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
         })
 
     if anomalies:
-        _fire_webhooks_with_retry(req.agent_id, {
+        events.append({
             "event": "anomaly",
             "agent_id": req.agent_id,
             "trace_id": trace_id,
@@ -297,7 +355,7 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
 
     milestones = [10, 50, 100, 500, 1000, 5000]
     if total_traces in milestones:
-        _fire_webhooks_with_retry(req.agent_id, {
+        events.append({
             "event": "milestone",
             "agent_id": req.agent_id,
             "milestone": total_traces,
@@ -309,7 +367,7 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
     # Tier change webhook
     old_tier = agent.get("certification_tier", "bronze")
     if new_tier != old_tier:
-        _fire_webhooks_with_retry(req.agent_id, {
+        events.append({
             "event": "tier_change",
             "agent_id": req.agent_id,
             "trace_id": trace_id,
@@ -319,7 +377,7 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
             "timestamp": now,
         })
 
-    return {
+    result = {
         "id": trace_id,
         "agent_id": req.agent_id,
         "task_description": req.task_description,
@@ -332,38 +390,174 @@ def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
         "created_at": now,
     }
 
+    return {
+        "trace_row": trace_row,
+        "agent_update": agent_update,
+        "history_row": history_row,
+        "events": events,
+        "result": result,
+    }
+
+
+def _load_trace_state(db, agent_id: str, api_key: str) -> tuple[dict, list[float]]:
+    """The agent row and its recent deltas, read concurrently."""
+    deltas_future = read_pool.submit(_fetch_recent_deltas, db, agent_id)
+    agent = _load_agent_for_write(db, agent_id, api_key)
+    return agent, deltas_future.result()
+
+
+def _record_traces(db, agent: dict, scored_all: list[dict]) -> None:
+    """Write the traces, the final agent state and the history in one transaction.
+
+    agent is the row the traces were scored against. Its cache entry is
+    dropped before the write; record_traces refuses a deactivated agent and
+    returns the row as committed, which is what gets cached.
+    """
+    invalidate_agent_row(agent["id"])
+    try:
+        updated = db.rpc("record_traces", {
+            "target_id": agent["id"],
+            "trace_rows": [s["trace_row"] for s in scored_all],
+            "agent_update": scored_all[-1]["agent_update"],
+            "history_rows": [s["history_row"] for s in scored_all],
+        }).execute().data
+    except APIError as e:
+        if e.code == "P0002":
+            raise PermissionError("Agent has been deactivated")
+        raise
+    invalidate_trust_cache(agent["id"])
+    if isinstance(updated, list):
+        updated = updated[0] if updated else None
+    if updated:
+        cache_agent_row(updated)
+
+
+def submit_trace(req: TraceSubmitRequest, api_key: str) -> dict:
+    """Trace submission: 5-dimensional scoring, tier calculation, security analysis."""
+    db = get_supabase()
+
+    agent, recent_deltas = _load_trace_state(db, req.agent_id, api_key)
+    scored = _score_trace(agent, req, recent_deltas)
+    _record_traces(db, agent, [scored])
+
+    for event in scored["events"]:
+        _fire_webhooks_with_retry(req.agent_id, event)
+
+    return scored["result"]
+
+
+def submit_traces_bulk(traces: list[TraceSubmitRequest], api_key: str) -> list[dict]:
+    """Batch submission for a single agent: one agent read, one transactional write.
+
+    Traces are scored in order, each on top of the state left by the one
+    before, so scores match submitting them one at a time.
+    """
+    agent_id = traces[0].agent_id
+    db = get_supabase()
+
+    agent, recent_deltas = _load_trace_state(db, agent_id, api_key)
+
+    scored_all = []
+    for req in traces:
+        scored = _score_trace(agent, req, recent_deltas)
+        agent = {**agent, **scored["agent_update"]}
+        recent_deltas = [scored["result"]["trust_delta"], *recent_deltas][:20]
+        scored_all.append(scored)
+
+    _record_traces(db, agent, scored_all)
+
+    for scored in scored_all:
+        for event in scored["events"]:
+            _fire_webhooks_with_retry(agent_id, event)
+
+    return [s["result"] for s in scored_all]
+
+
+# Webhook delivery runs on one background thread with its own event loop,
+# so events cost a queue put on the request path and deliveries share one
+# keep-alive connection pool. Started on the first event.
+_webhook_queue: queue.SimpleQueue = queue.SimpleQueue()
+_webhook_thread: threading.Thread | None = None
+_webhook_thread_lock = threading.Lock()
+
+_WEBHOOK_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+_WEBHOOK_TIMEOUT = 5.0
+
+# agent_id -> active webhooks, so a burst of events from one trace (or a
+# batch) reads the webhooks table once. Only touched on the worker thread;
+# webhook CRUD queues an invalidation ahead of any later events.
+WEBHOOK_HOOKS_TTL = 5
+_hooks_cache: TTLCache = TTLCache(maxsize=4096, ttl=WEBHOOK_HOOKS_TTL)
+
+
+def invalidate_hooks_cache(agent_id: str) -> None:
+    if _webhook_thread is not None:
+        _webhook_queue.put_nowait((str(uuid.UUID(agent_id)), None))
+
 
 def _fire_webhooks_with_retry(agent_id: str, payload: dict):
-    thread = threading.Thread(
-        target=_fire_webhooks_sync, args=(agent_id, payload), daemon=True
+    global _webhook_thread
+    if _webhook_thread is None:
+        with _webhook_thread_lock:
+            if _webhook_thread is None:
+                _webhook_thread = threading.Thread(
+                    target=lambda: asyncio.run(_webhook_worker()),
+                    name="garl-webhooks",
+                    daemon=True,
+                )
+                _webhook_thread.start()
+    _webhook_queue.put_nowait((str(uuid.UUID(agent_id)), payload))
+
+
+async def _webhook_worker():
+    async with httpx.AsyncClient(http2=True, limits=_WEBHOOK_LIMITS, timeout=_WEBHOOK_TIMEOUT) as client:
+        pending: set[asyncio.Task] = set()
+        while True:
+            agent_id, payload = await asyncio.to_thread(_webhook_queue.get)
+            if payload is None:
+                _hooks_cache.pop(agent_id, None)
+                continue
+            task = asyncio.create_task(_fire_webhooks(client, agent_id, payload))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+
+def _fetch_active_hooks(agent_id: str) -> list[dict]:
+    db = get_supabase()
+    hooks_res = (
+        db.table("webhooks")
+        .select("*")
+        .eq("agent_id", agent_id)
+        .eq("is_active", True)
+        .execute()
     )
-    thread.start()
+    return hooks_res.data or []
 
 
-def _fire_webhooks_sync(agent_id: str, payload: dict):
+async def _fire_webhooks(client: httpx.AsyncClient, agent_id: str, payload: dict):
     try:
-        db = get_supabase()
-        hooks_res = (
-            db.table("webhooks")
-            .select("*")
-            .eq("agent_id", agent_id)
-            .eq("is_active", True)
-            .execute()
-        )
-        for hook in (hooks_res.data or []):
-            event_type = payload.get("event", "")
-            if event_type not in (hook.get("events") or []):
-                continue
-            _deliver_webhook(db, hook, payload)
+        hooks = _hooks_cache.get(agent_id)
+        if hooks is None:
+            hooks = _hooks_cache[agent_id] = await asyncio.to_thread(_fetch_active_hooks, agent_id)
+        event_type = payload.get("event", "")
+        await asyncio.gather(*(
+            _deliver_webhook(client, hook, payload)
+            for hook in hooks
+            if event_type in (hook.get("events") or [])
+        ))
     except Exception:
         logger.warning("Failed to deliver webhooks for agent %s", agent_id)
 
 
-def _deliver_webhook(db, hook: dict, payload: dict):
-    body = json.dumps(payload, default=str)
-    sig = hmac.new(
-        hook["secret"].encode(), body.encode(), hashlib.sha256
-    ).hexdigest()
+def _mark_webhook_triggered(hook_id: str):
+    get_supabase().table("webhooks").update(
+        {"last_triggered_at": datetime.now(timezone.utc).isoformat()}
+    ).eq("id", hook_id).execute()
+
+
+async def _deliver_webhook(client: httpx.AsyncClient, hook: dict, payload: dict):
+    body = json.dumps(payload, default=str).encode()
+    sig = hmac.new(hook["secret"].encode(), body, hashlib.sha256).hexdigest()
     headers = {
         "Content-Type": "application/json",
         "X-GARL-Signature": sig,
@@ -371,21 +565,14 @@ def _deliver_webhook(db, hook: dict, payload: dict):
 
     for attempt in range(MAX_WEBHOOK_RETRIES):
         try:
-            resp = httpx.post(
-                hook["url"],
-                content=body,
-                headers=headers,
-                timeout=5.0,
-            )
+            resp = await client.post(hook["url"], content=body, headers=headers)
             if resp.status_code < 500:
-                db.table("webhooks").update(
-                    {"last_triggered_at": datetime.now(timezone.utc).isoformat()}
-                ).eq("id", hook["id"]).execute()
+                await asyncio.to_thread(_mark_webhook_triggered, hook["id"])
                 return
         except Exception as e:
             logger.warning("Webhook delivery attempt %d failed for %s: %s", attempt + 1, hook["url"], e)
 
         backoff = 2 ** attempt
-        time.sleep(backoff)
+        await asyncio.sleep(backoff)
 
     logger.error("Webhook delivery failed after %d attempts for %s", MAX_WEBHOOK_RETRIES, hook["url"])
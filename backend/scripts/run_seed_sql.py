@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-"""Execute seed SQL files via Supabase REST API (service role)."""
+"""Execute seed SQL files via Supabase REST API (service role).
+
+Batches within a file are posted concurrently over one HTTP/2 client.
+Pass --dry-run to count the batches without sending anything.
+"""
+import asyncio
 import httpx
 import os
 import sys
@@ -17,57 +22,69 @@ FILES = [
     "/tmp/garl_seed_history.sql",
 ]
 
-def run_sql_batch(sql: str, label: str):
-    """Run SQL via Supabase's pg REST endpoint."""
+BATCH_SIZE = 10
+MAX_CONCURRENCY = 16
+
+
+async def upload_file(client: httpx.AsyncClient, filepath: str, headers: dict) -> bool:
+    """Post one seed file in concurrent batches; rows within a file are independent.
+
+    After the first failed batch no further batches are started; ones
+    already in flight finish.
+    """
+    with open(filepath) as f:
+        lines = f.readlines()
+
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    failed = asyncio.Event()
+
+    async def upload(i: int) -> bool:
+        batch = "".join(lines[i:i+BATCH_SIZE])
+        label = f"rows {i+1}-{min(i+BATCH_SIZE, len(lines))}"
+        async with sem:
+            if failed.is_set():
+                return False
+            resp = await client.post(f"{SUPABASE_URL}/pg", headers=headers, content=batch)
+        if resp.status_code < 300:
+            print(f"  ✓ {label}")
+            return True
+        failed.set()
+        print(f"  ✗ {label}: {resp.status_code}")
+        print(f"    {resp.text[:300]}")
+        return False
+
+    results = await asyncio.gather(*[upload(i) for i in range(0, len(lines), BATCH_SIZE)])
+    if not all(results):
+        return False
+    print(f"  Done: {len(lines)} rows")
+    return True
+
+
+def dry_run() -> bool:
+    """Count the batches each file would send, without sending anything."""
+    for filepath in FILES:
+        with open(filepath) as f:
+            lines = f.readlines()
+        batches = -(-len(lines) // BATCH_SIZE)
+        print(f"{filepath}: {len(lines)} rows in {batches} batches")
+    return True
+
+
+async def main():
     headers = {
         "apikey": SERVICE_KEY,
         "Authorization": f"Bearer {SERVICE_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=minimal",
+        "Content-Type": "text/plain",
     }
-    resp = httpx.post(
-        f"{SUPABASE_URL}/rest/v1/rpc/",
-        headers=headers,
-        json={"query": sql},
-        timeout=60.0,
-    )
-    if resp.status_code < 300:
-        print(f"  ✓ {label}")
-    else:
-        print(f"  ✗ {label}: {resp.status_code} {resp.text[:200]}")
-
-def main():
-    for filepath in FILES:
-        print(f"\nProcessing: {filepath}")
-        with open(filepath) as f:
-            lines = f.readlines()
-        
-        batch_size = 10
-        for i in range(0, len(lines), batch_size):
-            batch = "".join(lines[i:i+batch_size])
-            label = f"  rows {i+1}-{min(i+batch_size, len(lines))}"
-            
-            headers = {
-                "apikey": SERVICE_KEY,
-                "Authorization": f"Bearer {SERVICE_KEY}",
-                "Content-Type": "text/plain",
-            }
-            resp = httpx.post(
-                f"{SUPABASE_URL}/pg",
-                headers=headers,
-                content=batch,
-                timeout=60.0,
-            )
-            if resp.status_code < 300:
-                print(f"  ✓ rows {i+1}-{min(i+batch_size, len(lines))}")
-            else:
-                print(f"  ✗ rows {i+1}-{min(i+batch_size, len(lines))}: {resp.status_code}")
-                print(f"    {resp.text[:300]}")
+    limits = httpx.Limits(max_connections=MAX_CONCURRENCY)
+    async with httpx.AsyncClient(http2=True, limits=limits, timeout=60.0) as client:
+        # Files run in order: traces and history reference the seeded agents.
+        for filepath in FILES:
+            print(f"\nProcessing: {filepath}")
+            if not await upload_file(client, filepath, headers):
                 return False
-        
-        print(f"  Done: {len(lines)} rows")
     return True
 
 if __name__ == "__main__":
-    success = main()
+    success = dry_run() if "--dry-run" in sys.argv else asyncio.run(main())
     sys.exit(0 if success else 1)
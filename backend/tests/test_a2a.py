@@ -18,6 +18,18 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def _reset_a2a_caches():
+    """Cached route/trust data must not leak between tests that mock the services."""
+    from app.api import a2a
+    from app.services.agents import trust_cache
+    a2a._route_cache.clear()
+    trust_cache.clear()
+    yield
+    a2a._route_cache.clear()
+    trust_cache.clear()
+
+
 MOCK_AGENT_ID = "a1b2c3d4-e5f6-4789-a012-345678901234"
 
 MOCK_TRUST_DATA = {
@@ -153,6 +165,39 @@ class TestA2AVersionMiddleware:
         data = resp.json()
         assert data["error"]["message"] == "VersionNotSupported"
 
+    def test_a2a_endpoint_rejects_unsupported_version(self, client):
+        resp = client.post(
+            "/a2a",
+            content="{}",
+            headers={"Content-Type": "application/json", "A2A-Version": " 0.2 "},
+        )
+        assert resp.status_code == 400
+        assert resp.headers["content-type"] == "application/json"
+        data = resp.json()
+        assert data["id"] is None
+        assert data["error"]["code"] == -32001
+        assert data["error"]["data"] == {"supported": ["1.0"], "requested": "0.2"}
+
+    def test_version_rejection_keeps_security_headers(self, client):
+        resp = client.post(
+            "/a2a",
+            content="{}",
+            headers={"Content-Type": "application/json", "A2A-Version": "0.2"},
+        )
+        assert resp.status_code == 400
+        assert resp.headers["x-content-type-options"] == "nosniff"
+
+    def test_preflight_not_version_checked(self, client):
+        resp = client.options(
+            "/a2a",
+            headers={
+                "Origin": "http://localhost:3000",
+                "Access-Control-Request-Method": "POST",
+                "A2A-Version": "0.2",
+            },
+        )
+        assert resp.status_code == 200
+
     def test_valid_version_accepted(self, client):
         resp = client.get(
             "/.well-known/agent-card.json",
@@ -187,6 +232,20 @@ class TestA2AJsonRpc:
         data = resp.json()
         assert data["error"]["code"] == -32600
 
+    def test_non_object_body_rejected(self, client):
+        resp = client.post("/a2a", json=[1, 2, 3], headers={"A2A-Version": "1.0"})
+        data = resp.json()
+        assert data["error"]["code"] == -32600
+
+    def test_non_object_params_rejected(self, client):
+        resp = client.post(
+            "/a2a",
+            json={"jsonrpc": "2.0", "method": "SendMessage", "params": ["x"], "id": "1"},
+            headers={"A2A-Version": "1.0"},
+        )
+        data = resp.json()
+        assert data["error"]["code"] == -32602
+
     def test_method_not_found(self, client):
         resp = client.post(
             "/a2a",
@@ -260,6 +319,31 @@ class TestA2AJsonRpc:
         assert trust_result["registered"] is True
         assert trust_result["trust_score"] == 82.5
 
+    @patch("app.api.a2a.get_a2a_trust")
+    def test_trust_check_served_from_cache(self, mock_trust, client):
+        from app.services.agents import invalidate_trust_cache
+        mock_trust.return_value = MOCK_TRUST_DATA.copy()
+        body = {
+            "jsonrpc": "2.0",
+            "method": "SendMessage",
+            "id": "req-cache",
+            "params": {
+                "message": {
+                    "role": "ROLE_USER",
+                    "parts": [{"text": f"check trust {MOCK_AGENT_ID}"}],
+                    "messageId": "msg-cache",
+                }
+            },
+        }
+        first = client.post("/a2a", json=body, headers={"A2A-Version": "1.0"}).json()
+        second = client.post("/a2a", json=body, headers={"A2A-Version": "1.0"}).json()
+        assert mock_trust.call_count == 1
+        assert first["result"]["task"]["id"] != second["result"]["task"]["id"]
+
+        invalidate_trust_cache(MOCK_AGENT_ID)
+        client.post("/a2a", json=body, headers={"A2A-Version": "1.0"})
+        assert mock_trust.call_count == 2
+
     @patch("app.api.a2a.get_a2a_trust")
     def test_send_message_unregistered_agent(self, mock_trust, client):
         mock_trust.return_value = None
@@ -395,6 +479,29 @@ class TestA2AJsonRpc:
         assert task["status"]["state"] == "TASK_STATE_COMPLETED"
         mock_route.assert_called_once_with("coding", "silver", 3)
 
+    @patch("app.api.a2a.route_agents")
+    def test_route_data_shared_across_phrasings(self, mock_route, client):
+        mock_route.return_value = {"category": "coding", "min_tier": "silver", "recommendations": []}
+        for i, text in enumerate(["recommend a coding agent", "route this coding job"]):
+            resp = client.post(
+                "/a2a",
+                json={
+                    "jsonrpc": "2.0",
+                    "method": "SendMessage",
+                    "id": f"req-route-{i}",
+                    "params": {
+                        "message": {
+                            "role": "ROLE_USER",
+                            "parts": [{"text": text}],
+                            "messageId": f"msg-route-{i}",
+                        }
+                    },
+                },
+                headers={"A2A-Version": "1.0"},
+            )
+            assert "error" not in resp.json()
+        mock_route.assert_called_once_with("coding", "silver", 3)
+
     @patch("app.api.a2a.get_a2a_trust")
     def test_send_message_did_extraction(self, mock_trust, client):
         mock_trust.return_value = MOCK_TRUST_DATA.copy()
@@ -428,3 +535,58 @@ class TestA2AJsonRpc:
         data = resp.json()
         assert data["jsonrpc"] == "2.0"
         assert data["id"] == 42
+
+
+class TestIntentHelpers:
+    """Free-form text parsing helpers used by SendMessage."""
+
+    def test_find_uuids_single(self):
+        from app.api.a2a import _find_uuids
+        assert _find_uuids(f"check trust {MOCK_AGENT_ID} please") == [MOCK_AGENT_ID]
+
+    def test_find_uuids_multiple_and_uppercase(self):
+        from app.api.a2a import _find_uuids
+        upper = MOCK_AGENT_ID.upper()
+        assert _find_uuids(f"compare {MOCK_AGENT_ID} vs {upper}") == [MOCK_AGENT_ID, upper]
+
+    def test_find_uuids_rejects_malformed(self):
+        from app.api.a2a import _find_uuids
+        assert _find_uuids("a1b2c3d4-e5f6-4789-a012-34567890123") == []
+        assert _find_uuids("a1b2c3d4-e5f6-4789-a0z2-345678901234") == []
+        assert _find_uuids("no ids here - at all") == []
+
+    def test_find_uuids_limit(self):
+        from app.api.a2a import _find_uuids
+        text = f"{MOCK_AGENT_ID} {MOCK_AGENT_ID}"
+        assert _find_uuids(text, limit=1) == [MOCK_AGENT_ID]
+
+    def test_detect_intent_priority(self):
+        from app.api.a2a import _detect_intent
+        assert _detect_intent("recommend a coding agent, compare later") == (
+            "route_agent", (("category", "coding"),),
+        )
+        assert _detect_intent("register then compare")[0] == "compare_agents"
+        assert _detect_intent("please onboard me") == ("register_agent", ())
+        assert _detect_intent(f"trust {MOCK_AGENT_ID}") == (
+            "trust_check", (("agent_id", MOCK_AGENT_ID),),
+        )
+
+    def test_detect_intent_normalizes_id_case(self):
+        from app.api.a2a import _detect_intent
+        assert _detect_intent(f"DID:GARL:{MOCK_AGENT_ID.upper()}") == (
+            "trust_check", (("agent_id", MOCK_AGENT_ID),),
+        )
+
+    def test_detect_intent_is_cached(self):
+        from app.api.a2a import _detect_intent
+        _detect_intent.cache_clear()
+        first = _detect_intent(f"check trust {MOCK_AGENT_ID}")
+        second = _detect_intent(f"check trust {MOCK_AGENT_ID}")
+        assert first is second
+        assert _detect_intent.cache_info().hits == 1
+
+    def test_new_id_unique_hex(self):
+        from app.api.a2a import _new_id, _ID_BATCH
+        ids = {_new_id() for _ in range(_ID_BATCH * 3)}
+        assert len(ids) == _ID_BATCH * 3
+        assert all(len(i) == 32 and int(i, 16) >= 0 for i in ids)
@@ -287,6 +287,19 @@ class TestComputeConsistencyScore:
         score = compute_consistency_score(50.0, [5.0, -5.0, 10.0, -8.0])
         assert score < 50.0
 
+    @pytest.mark.parametrize("deltas", [
+        [0.0, 0.5, 1.0],
+        [0.1, 0.6, 1.1],
+        [-1.5, 0.0, 1.5],
+        [0.3, 3.3, 6.3],
+    ])
+    def test_band_edges_match_exact_stdev(self, deltas):
+        """Deltas whose stdev sits on a band edge land in the same band as statistics.stdev."""
+        import statistics
+        sd = statistics.stdev(deltas)
+        expected = 1.0 if sd < 0.5 else 0.3 if sd < 1.5 else -0.5 if sd < 3.0 else -1.5
+        assert compute_consistency_score(50.0, deltas) == 50.0 + expected
+
 
 # --- compute_composite_score ---
 class TestComputeCompositeScore:
@@ -3,8 +3,10 @@ GARL Protocol v1.0 — API route integration tests.
 
 Verifies endpoint behavior with FastAPI TestClient.
 """
+import re
+
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from fastapi.testclient import TestClient
 
 from app.main import app
@@ -133,6 +135,50 @@ class TestHealthEndpoint:
         assert resp.status_code == 200
         assert resp.json()["status"] == "healthy"
 
+    def test_probe_short_circuit_matches_route(self, client):
+        """Probes answered by HealthProbeMiddleware match the route's body."""
+        import asyncio
+        from app.main import health
+
+        probe = client.get("/api/v1/health")
+        assert probe.status_code == 200
+        assert probe.json() == asyncio.run(health())
+        assert probe.headers["x-content-type-options"] == "nosniff"
+
+    def test_browser_request_keeps_cors(self, client):
+        """Requests with an Origin still pass through CORS."""
+        resp = client.get("/health", headers={"Origin": "http://localhost:3000"})
+        assert resp.status_code == 200
+        assert resp.headers["access-control-allow-origin"] == "http://localhost:3000"
+
+
+class TestCorsPreflight:
+    """CORS preflight against the explicit method/header lists."""
+
+    def test_preflight_allows_api_key_header(self, client):
+        resp = client.options(
+            "/api/v1/verify",
+            headers={
+                "Origin": "http://localhost:3000",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "content-type, x-api-key",
+            },
+        )
+        assert resp.status_code == 200
+        assert "x-api-key" in resp.headers["access-control-allow-headers"]
+        assert "PATCH" in resp.headers["access-control-allow-methods"]
+
+    def test_preflight_rejects_unknown_header(self, client):
+        resp = client.options(
+            "/api/v1/verify",
+            headers={
+                "Origin": "http://localhost:3000",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "x-unknown",
+            },
+        )
+        assert resp.status_code == 400
+
 
 class TestCreateAgent:
     """POST /api/v1/agents endpoint tests."""
@@ -165,6 +211,20 @@ class TestTrustRoute:
         assert data["category"] == "coding"
         assert data["min_tier"] == "silver"
 
+    @pytest.mark.parametrize("min_tier,expected", [
+        ("gold", ("gold", "enterprise")),
+        ("bronze", ("bronze", "silver", "gold", "enterprise")),
+        ("platinum", ("silver", "gold", "enterprise")),
+    ])
+    def test_min_tier_filter(self, min_tier, expected):
+        from app.services.agents import route_agents
+        db = MagicMock()
+        query = db.table.return_value.select.return_value.eq.return_value.eq.return_value.gt.return_value
+        query.in_.return_value.order.return_value.limit.return_value.execute.return_value = MagicMock(data=[])
+        with patch("app.services.agents.get_supabase", return_value=db):
+            route_agents("coding", min_tier)
+        query.in_.assert_called_once_with("certification_tier", expected)
+
 
 class TestComplianceReport:
     """GET /api/v1/agents/{id}/compliance endpoint tests."""
@@ -182,6 +242,25 @@ class TestComplianceReport:
         assert "sla_compliance" in data
         assert "security_risks" in data
 
+    def test_endorsements_are_summarised(self, client, mock_supabase_for_routes):
+        """Counts and bonus come from one aggregate, not the full endorsement list."""
+        mock_supabase_for_routes.rpc.return_value.execute.return_value = MagicMock(
+            data={"received_count": 1200, "given_count": 3, "total_bonus": 41.25}
+        )
+        resp = client.get(
+            "/api/v1/agents/a1b2c3d4-e5f6-4789-a012-345678901234/compliance",
+            headers={"x-api-key": "test-read-key"},
+        )
+        assert resp.status_code == 200
+        summary = resp.json()["endorsement_summary"]
+        assert summary["received_count"] == 1200
+        assert summary["given_count"] == 3
+        assert summary["total_endorsement_bonus"] == 41.25
+        assert isinstance(summary["recent_received"], list)
+        mock_supabase_for_routes.rpc.assert_called_once_with(
+            "get_endorsement_summary", {"aid": "a1b2c3d4-e5f6-4789-a012-345678901234"}
+        )
+
 
 class TestRateLimiting:
     """Rate limiting tests."""
@@ -201,3 +280,921 @@ class TestRateLimiting:
                 "category": "other",
             })
             assert resp.status_code == 429
+
+
+class TestInferCategory:
+    """OpenClaw category inference tests."""
+
+    def test_keyword_counts(self):
+        from app.api.routes import _infer_category
+        assert _infer_category("Fix the bug and deploy") == "coding"
+        assert _infer_category("Send an outreach email to the lead") == "sales"
+        assert _infer_category("hello there") == "other"
+
+    def test_prefix_keywords_both_count(self):
+        """'database' also contains 'data'; both keywords should score."""
+        from app.api.routes import _infer_category
+        assert _infer_category("Database migration for the customer") == "data"
+
+    def test_tie_prefers_declaration_order(self):
+        from app.api.routes import _infer_category
+        assert _infer_category("pipeline") == "data"
+
+
+class TestVerifyBatch:
+    """Batch trace submission tests."""
+
+    AGENT_ID = "a1b2c3d4-e5f6-4789-a012-345678901234"
+
+    def _batch(self, n=3):
+        return {"traces": [
+            {"agent_id": self.AGENT_ID, "task_description": f"task {i}", "status": "success", "duration_ms": 100}
+            for i in range(n)
+        ]}
+
+    def test_batch_submitted_in_one_call(self, client):
+        submitted = [{"id": f"t{i}", "trust_delta": 0.5} for i in range(3)]
+        with patch("app.api.routes.submit_traces_bulk", return_value=submitted) as bulk:
+            resp = client.post("/api/v1/verify/batch", json=self._batch(), headers={"x-api-key": "garl_batch_ok"})
+        assert resp.status_code == 200
+        assert bulk.call_count == 1
+        assert len(bulk.call_args.args[0]) == 3
+        data = resp.json()
+        assert data["submitted"] == 3
+        assert data["failed"] == 0
+        assert [r["id"] for r in data["results"]] == ["t0", "t1", "t2"]
+
+    def test_ownership_error_fails_every_trace(self, client):
+        with patch("app.api.routes.submit_traces_bulk", side_effect=PermissionError("Invalid API key for this agent")):
+            resp = client.post("/api/v1/verify/batch", json=self._batch(2), headers={"x-api-key": "garl_batch_bad"})
+        data = resp.json()
+        assert data["submitted"] == 0
+        assert data["failed"] == 2
+        assert all(r["detail"] == "Invalid API key for this agent" for r in data["results"])
+
+
+class TestTraceWrites:
+    """submit_trace / submit_traces_bulk write through one record_traces RPC."""
+
+    AGENT_ID = "a1b2c3d4-e5f6-4789-a012-345678901234"
+
+    def _db(self):
+        from app.services.agents import hash_api_key
+        db = MagicMock()
+        agent = {
+            "id": self.AGENT_ID, "name": "Writer", "api_key_hash": hash_api_key("garl_write"),
+            "trust_score": 50.0, "total_traces": 0, "success_count": 0, "certification_tier": "bronze",
+        }
+        db.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(data=[agent])
+
+        def record_traces(fn, params):
+            # The RPC returns the agents row as committed.
+            return MagicMock(**{"execute.return_value": MagicMock(data={**agent, **params["agent_update"]})})
+        db.rpc.side_effect = record_traces
+        return db
+
+    def _req(self, i=0):
+        from app.models.schemas import TraceSubmitRequest
+        return TraceSubmitRequest(
+            agent_id=self.AGENT_ID, task_description=f"task {i}", status="success", duration_ms=100
+        )
+
+    def test_single_trace_is_one_write(self):
+        from app.services.traces import submit_trace
+        db = self._db()
+        with patch("app.services.traces.get_supabase", return_value=db), \
+                patch("app.services.traces._fire_webhooks_with_retry"):
+            result = submit_trace(self._req(), "garl_write")
+        db.rpc.assert_called_once()
+        fn, params = db.rpc.call_args[0]
+        assert fn == "record_traces"
+        assert params["target_id"] == self.AGENT_ID
+        assert [t["id"] for t in params["trace_rows"]] == [result["id"]]
+        assert params["agent_update"]["total_traces"] == 1
+        assert len(params["history_rows"]) == 1
+        db.table.return_value.insert.assert_not_called()
+        db.table.return_value.update.assert_not_called()
+
+    def test_bulk_writes_final_agent_state(self):
+        from app.services.traces import submit_traces_bulk
+        db = self._db()
+        with patch("app.services.traces.get_supabase", return_value=db), \
+                patch("app.services.traces._fire_webhooks_with_retry"):
+            submit_traces_bulk([self._req(i) for i in range(3)], "garl_write")
+        db.rpc.assert_called_once()
+        params = db.rpc.call_args[0][1]
+        assert len(params["trace_rows"]) == 3
+        assert len(params["history_rows"]) == 3
+        assert params["agent_update"]["total_traces"] == 3
+
+    def test_cached_agent_row_skips_select_and_is_written_through(self):
+        import orjson
+        from app.services.traces import submit_trace
+        db = self._db()
+        cached = db.table.return_value.select.return_value.eq.return_value.execute.return_value.data[0]
+        redis = MagicMock()
+        redis.get.return_value = orjson.dumps(cached)
+        with patch("app.services.traces.get_supabase", return_value=db), \
+                patch("app.services.agents._get_agent_row_redis", return_value=redis), \
+                patch("app.services.traces._fire_webhooks_with_retry"):
+            submit_trace(self._req(), "garl_write")
+        tables = [c.args[0] for c in db.table.call_args_list]
+        assert "agents" not in tables
+        key, ttl, payload = redis.setex.call_args.args
+        assert key == f"agent:{self.AGENT_ID}"
+        assert orjson.loads(payload)["total_traces"] == 1
+
+    def test_cache_entry_dropped_before_write(self):
+        from app.services.traces import submit_trace
+        db = self._db()
+        redis = MagicMock()
+        redis.get.return_value = None
+        redis.delete.side_effect = lambda key: db.rpc.assert_not_called()
+        with patch("app.services.traces.get_supabase", return_value=db), \
+                patch("app.services.agents._get_agent_row_redis", return_value=redis), \
+                patch("app.services.traces._fire_webhooks_with_retry"):
+            submit_trace(self._req(), "garl_write")
+        redis.delete.assert_called_once_with(f"agent:{self.AGENT_ID}")
+        db.rpc.assert_called_once()
+        redis.setex.assert_called_once()
+
+    def test_failed_auth_does_not_seed_cache(self):
+        from app.services.traces import submit_trace
+        db = self._db()
+        redis = MagicMock()
+        redis.get.return_value = None
+        with patch("app.services.traces.get_supabase", return_value=db), \
+                patch("app.services.agents._get_agent_row_redis", return_value=redis), \
+                pytest.raises(PermissionError):
+            submit_trace(self._req(), "garl_other")
+        redis.setex.assert_not_called()
+
+    def test_failed_cache_write_drops_stale_row(self):
+        from redis.exceptions import RedisError
+        from app.services.traces import submit_trace
+        db = self._db()
+        redis = MagicMock()
+        redis.get.return_value = None
+        redis.setex.side_effect = RedisError("busy")
+        with patch("app.services.traces.get_supabase", return_value=db), \
+                patch("app.services.agents._get_agent_row_redis", return_value=redis), \
+                patch("app.services.traces._fire_webhooks_with_retry"):
+            submit_trace(self._req(), "garl_write")
+        db.rpc.assert_called_once()
+        assert [c.args[0] for c in redis.delete.call_args_list] == [f"agent:{self.AGENT_ID}"] * 2
+
+    def test_redis_failure_falls_back_to_db(self):
+        from redis.exceptions import RedisError
+        from app.services.traces import submit_trace
+        db = self._db()
+        redis = MagicMock()
+        redis.get.side_effect = RedisError("down")
+        redis.setex.side_effect = RedisError("down")
+        with patch("app.services.traces.get_supabase", return_value=db), \
+                patch("app.services.agents._get_agent_row_redis", return_value=redis), \
+                patch("app.services.traces._fire_webhooks_with_retry"):
+            submit_trace(self._req(), "garl_write")
+        assert "agents" in [c.args[0] for c in db.table.call_args_list]
+        db.rpc.assert_called_once()
+
+    def test_caches_row_returned_by_write(self):
+        import orjson
+        from app.services.traces import submit_trace
+        db = self._db()
+        committed = {"id": self.AGENT_ID, "total_traces": 7, "endorsement_score": 1.5}
+        db.rpc.side_effect = None
+        db.rpc.return_value.execute.return_value = MagicMock(data=committed)
+        redis = MagicMock()
+        redis.get.return_value = None
+        with patch("app.services.traces.get_supabase", return_value=db), \
+                patch("app.services.agents._get_agent_row_redis", return_value=redis), \
+                patch("app.services.traces._fire_webhooks_with_retry"):
+            submit_trace(self._req(), "garl_write")
+        assert orjson.loads(redis.setex.call_args.args[2]) == committed
+
+    def test_agent_deleted_mid_write_is_rejected_and_not_cached(self):
+        from postgrest.exceptions import APIError
+        from app.services.traces import submit_trace
+        db = self._db()
+        db.rpc.side_effect = APIError({"code": "P0002", "message": "Agent not found or deactivated"})
+        redis = MagicMock()
+        redis.get.return_value = None
+        with patch("app.services.traces.get_supabase", return_value=db), \
+                patch("app.services.agents._get_agent_row_redis", return_value=redis), \
+                patch("app.services.traces._fire_webhooks_with_retry") as fire, \
+                pytest.raises(PermissionError):
+            submit_trace(self._req(), "garl_write")
+        redis.delete.assert_called_once_with(f"agent:{self.AGENT_ID}")
+        redis.setex.assert_not_called()
+        fire.assert_not_called()
+
+    def test_wrong_key_writes_nothing(self):
+        from app.services.traces import submit_trace
+        db = self._db()
+        with patch("app.services.traces.get_supabase", return_value=db), \
+                pytest.raises(PermissionError):
+            submit_trace(self._req(), "garl_other")
+        db.rpc.assert_not_called()
+
+
+class TestWebhookDelivery:
+    """Webhook fan-out on the shared worker loop."""
+
+    AGENT_ID = "a1b2c3d4-e5f6-4789-a012-345678901234"
+
+    def setup_method(self):
+        from app.services.traces import _hooks_cache
+        _hooks_cache.clear()
+
+    def test_matching_hooks_share_one_lookup(self):
+        import asyncio
+        import hashlib
+        import hmac
+        from app.services.traces import _fire_webhooks
+
+        hooks = [
+            {"id": "h1", "url": "https://a.example/hook", "secret": "s1", "events": ["trace_recorded"]},
+            {"id": "h2", "url": "https://b.example/hook", "secret": "s2", "events": ["anomaly"]},
+        ]
+        client = MagicMock()
+        client.post = AsyncMock(return_value=MagicMock(status_code=200))
+
+        async def run():
+            await _fire_webhooks(client, self.AGENT_ID, {"event": "trace_recorded"})
+            await _fire_webhooks(client, self.AGENT_ID, {"event": "anomaly"})
+
+        with patch("app.services.traces._fetch_active_hooks", return_value=hooks) as fetch, \
+                patch("app.services.traces._mark_webhook_triggered"):
+            asyncio.run(run())
+        assert fetch.call_count == 1
+        assert [c.args[0] for c in client.post.call_args_list] == [
+            "https://a.example/hook", "https://b.example/hook",
+        ]
+        first = client.post.call_args_list[0].kwargs
+        expected = hmac.new(b"s1", first["content"], hashlib.sha256).hexdigest()
+        assert first["headers"]["X-GARL-Signature"] == expected
+
+    def test_worker_drops_cached_hooks_on_invalidation(self):
+        import asyncio
+        from app.services import traces
+
+        traces._hooks_cache[self.AGENT_ID] = [{"id": "old"}]
+        fake_queue = MagicMock()
+        fake_queue.get.side_effect = [(self.AGENT_ID, None), RuntimeError("stop")]
+        with patch("app.services.traces._webhook_queue", fake_queue), \
+                patch("app.services.traces._fire_webhooks") as fire, \
+                pytest.raises(RuntimeError):
+            asyncio.run(traces._webhook_worker())
+        assert self.AGENT_ID not in traces._hooks_cache
+        fire.assert_not_called()
+
+    def test_server_errors_retry_without_blocking(self):
+        import asyncio
+        from app.services.traces import _deliver_webhook, MAX_WEBHOOK_RETRIES
+
+        client = MagicMock()
+        client.post = AsyncMock(return_value=MagicMock(status_code=503))
+        hook = {"id": "h1", "url": "https://a.example/hook", "secret": "s1"}
+        with patch("app.services.traces.asyncio.sleep", new=AsyncMock()) as sleep:
+            asyncio.run(_deliver_webhook(client, hook, {"event": "anomaly"}))
+        assert client.post.call_count == MAX_WEBHOOK_RETRIES
+        assert [c.args[0] for c in sleep.call_args_list] == [1, 2, 4]
+
+
+class TestAgentDetail:
+    """GET /api/v1/agents/{id}/detail concurrent reads."""
+
+    AGENT_ID = "a1b2c3d4-e5f6-4789-a012-345678901234"
+
+    def _db(self, agent_rows):
+        tables = {
+            "agents": MagicMock(),
+            "traces": MagicMock(),
+            "reputation_history": MagicMock(),
+        }
+        tables["agents"].select.return_value.eq.return_value.eq.return_value.execute.return_value = MagicMock(data=agent_rows)
+        for name, rows in (("traces", [{"id": "t1"}]), ("reputation_history", [{"id": "h1"}])):
+            tables[name].select.return_value.eq.return_value.order.return_value.limit.return_value \
+                .execute.return_value = MagicMock(data=rows)
+        db = MagicMock()
+        db.table.side_effect = tables.__getitem__
+        return db
+
+    def test_detail_combines_reads(self, client):
+        agent = {"id": self.AGENT_ID, "trust_score": 70.0, "api_key_hash": "secret"}
+        with patch("app.services.agents.get_supabase", return_value=self._db([agent])):
+            resp = client.get(f"/api/v1/agents/{self.AGENT_ID}/detail")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert "api_key_hash" not in data["agent"]
+        assert data["recent_traces"] == [{"id": "t1"}]
+        assert data["reputation_history"] == [{"id": "h1"}]
+        assert len(data["decay_projection"]) == 4
+
+    def test_missing_agent_404(self, client):
+        with patch("app.services.agents.get_supabase", return_value=self._db([])):
+            resp = client.get(f"/api/v1/agents/{self.AGENT_ID}/detail")
+        assert resp.status_code == 404
+
+
+class TestStats:
+    """GET /api/v1/stats."""
+
+    def setup_method(self):
+        from app.api.routes import _stats_cache
+        _stats_cache.clear()
+
+    def test_single_rpc(self, client):
+        db = MagicMock()
+        db.rpc.return_value.execute.return_value = MagicMock(data={
+            "total_agents": 12,
+            "total_traces": 340,
+            "top_agent": {"name": "A", "trust_score": 91.5, "certification_tier": "gold"},
+        })
+        with patch("app.services.agents.get_supabase", return_value=db):
+            resp = client.get("/api/v1/stats")
+        assert resp.status_code == 200
+        assert resp.json() == {
+            "total_agents": 12,
+            "total_traces": 340,
+            "top_agent": {"name": "A", "trust_score": 91.5, "certification_tier": "gold"},
+        }
+        db.rpc.assert_called_once_with("get_agent_stats")
+        db.table.assert_not_called()
+
+    def test_empty_database(self, client):
+        db = MagicMock()
+        db.rpc.return_value.execute.return_value = MagicMock(
+            data={"total_agents": 0, "total_traces": 0, "top_agent": None}
+        )
+        with patch("app.services.agents.get_supabase", return_value=db):
+            resp = client.get("/api/v1/stats")
+        assert resp.json() == {"total_agents": 0, "total_traces": 0, "top_agent": None}
+
+    def test_cached_between_calls(self, client):
+        db = MagicMock()
+        db.rpc.return_value.execute.return_value = MagicMock(
+            data={"total_agents": 1, "total_traces": 2, "top_agent": None}
+        )
+        with patch("app.services.agents.get_supabase", return_value=db):
+            first = client.get("/api/v1/stats")
+            second = client.get("/api/v1/stats")
+        assert first.json() == second.json()
+        db.rpc.assert_called_once()
+
+
+class TestEndorse:
+    """POST /api/v1/endorse via the apply_endorsement RPC."""
+
+    ENDORSER = "a1b2c3d4-e5f6-4789-a012-345678901234"
+    TARGET = "b1b2c3d4-e5f6-4789-a012-345678901234"
+
+    def _db(self):
+        from app.services.agents import hash_api_key
+        db = MagicMock()
+        endorser = {
+            "id": self.ENDORSER,
+            "api_key_hash": hash_api_key("garl_key"),
+            "trust_score": 80.0,
+            "total_traces": 100,
+            "certification_tier": "gold",
+        }
+        db.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(data=[endorser])
+        db.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = MagicMock(data=[endorser])
+        return db
+
+    def _post(self, client, db):
+        with patch("app.api.routes._get_supabase", return_value=db), \
+                patch("app.services.agents.get_supabase", return_value=db):
+            return client.post(
+                "/api/v1/endorse",
+                json={"target_agent_id": self.TARGET, "context": "good"},
+                headers={"x-api-key": "garl_key"},
+            )
+
+    def test_applied_in_one_rpc(self, client):
+        db = self._db()
+        db.rpc.return_value.execute.return_value = MagicMock(
+            data={"trust_score": 72.5, "certification_tier": "gold"}
+        )
+        resp = self._post(client, db)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["target_new_trust_score"] == 72.5
+        assert data["target_new_tier"] == "gold"
+        fn, params = db.rpc.call_args[0]
+        assert fn == "apply_endorsement"
+        assert params["endorsement"]["target_id"] == self.TARGET
+        db.table.return_value.update.assert_not_called()
+        db.table.return_value.insert.assert_not_called()
+
+    def test_duplicate_maps_to_400(self, client):
+        from postgrest.exceptions import APIError
+        db = self._db()
+        db.rpc.return_value.execute.side_effect = APIError({"code": "23505", "message": "duplicate key"})
+        resp = self._post(client, db)
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Endorsement already exists between these agents"
+
+    def test_missing_target_maps_to_400(self, client):
+        from postgrest.exceptions import APIError
+        db = self._db()
+        db.rpc.return_value.execute.side_effect = APIError({"code": "P0002", "message": "Target agent not found"})
+        resp = self._post(client, db)
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Target agent not found"
+
+
+class TestEndorsementsList:
+    """GET /api/v1/endorsements/{agent_id} in one query."""
+
+    AGENT = "a1b2c3d4-e5f6-4789-a012-345678901234"
+    OTHER = "b1b2c3d4-e5f6-4789-a012-345678901234"
+
+    E1 = "e1e2c3d4-e5f6-4789-a012-345678901234"
+
+    def _db(self, rows):
+        db = MagicMock()
+        query = db.table.return_value.select.return_value.or_.return_value
+        query.order.return_value.order.return_value.limit.return_value.execute.return_value = MagicMock(data=rows)
+        db.rpc.return_value.execute.return_value = MagicMock(data=0.75)
+        return db, query
+
+    def test_one_query_partitioned(self, client):
+        db, query = self._db([
+            {"id": "e1", "endorser_id": self.OTHER, "target_id": self.AGENT, "bonus_applied": 0.5},
+            {"id": "e2", "endorser_id": self.AGENT, "target_id": self.OTHER, "bonus_applied": 0.7},
+            {"id": "e3", "endorser_id": self.OTHER, "target_id": self.AGENT, "bonus_applied": 0.25},
+        ])
+        with patch("app.services.agents.get_supabase", return_value=db):
+            resp = client.get(f"/api/v1/endorsements/{self.AGENT.upper()}")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert [e["id"] for e in data["received"]] == ["e1", "e3"]
+        assert [e["id"] for e in data["given"]] == ["e2"]
+        assert "target_id" not in data["received"][0]
+        assert "endorser_id" not in data["given"][0]
+        assert data["total_endorsement_bonus"] == 0.75
+        assert data["next_cursor"] is None
+        assert db.table.call_count == 1
+        db.rpc.assert_called_once_with("endorsement_bonus_total", {"aid": self.AGENT})
+        db.table.return_value.select.return_value.or_.assert_called_once_with(
+            f"target_id.eq.{self.AGENT},endorser_id.eq.{self.AGENT}"
+        )
+        query.order.return_value.order.assert_called_once_with("id", desc=True)
+        query.order.return_value.order.return_value.limit.assert_called_once_with(100)
+
+    def test_full_page_returns_next_cursor(self, client):
+        created = "2026-03-01T12:00:00+00:00"
+        db, _ = self._db([
+            {"id": self.E1, "endorser_id": self.OTHER, "target_id": self.AGENT, "created_at": created},
+        ])
+        with patch("app.services.agents.get_supabase", return_value=db):
+            resp = client.get(f"/api/v1/endorsements/{self.AGENT}", params={"limit": 1})
+        assert resp.json()["next_cursor"] == f"{created},{self.E1}"
+
+    def test_cursor_breaks_created_at_ties_on_id(self, client):
+        created = "2026-03-01T12:00:00+00:00"
+        db, query = self._db([])
+        with patch("app.services.agents.get_supabase", return_value=db):
+            resp = client.get(
+                f"/api/v1/endorsements/{self.AGENT}",
+                params={"limit": 500, "cursor": f"{created},{self.E1}"},
+            )
+        assert resp.status_code == 200
+        db.table.return_value.select.return_value.or_.assert_called_once_with(
+            f"and(or(target_id.eq.{self.AGENT},endorser_id.eq.{self.AGENT}),"
+            f'or(created_at.lt."{created}",and(created_at.eq."{created}",id.lt.{self.E1})))'
+        )
+        query.order.return_value.order.return_value.limit.assert_called_once_with(100)
+
+    def test_invalid_cursor_is_400(self, client):
+        for cursor in ("yesterday", "2026-03-01T12:00:00+00:00", f"yesterday,{self.E1}", "2026-03-01T12:00:00,e1"):
+            resp = client.get(f"/api/v1/endorsements/{self.AGENT}", params={"cursor": cursor})
+            assert resp.status_code == 400, cursor
+
+
+class TestCompareAgents:
+    """GET /api/v1/compare batching."""
+
+    A = "a1b2c3d4-e5f6-4789-a012-345678901234"
+    B = "b1b2c3d4-e5f6-4789-a012-345678901234"
+
+    def test_single_query_keeps_caller_order(self, client):
+        db = MagicMock()
+        query = db.table.return_value.select.return_value
+        query.in_.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[{"id": self.A, "name": "A"}, {"id": self.B, "name": "B"}]
+        )
+        with patch("app.services.agents.get_supabase", return_value=db):
+            resp = client.get("/api/v1/compare", params={"agents": f"{self.B.upper()},{self.A}"})
+        assert resp.status_code == 200
+        assert [a["name"] for a in resp.json()] == ["B", "A"]
+        query.in_.assert_called_once_with("id", [self.B.upper(), self.A])
+        assert db.table.call_count == 1
+
+
+class TestOwnershipCache:
+    """_verify_agent_ownership caching tests."""
+
+    AGENT_ID = "a1b2c3d4-e5f6-4789-a012-345678901234"
+
+    def _db(self, api_key):
+        from app.services.agents import hash_api_key
+        db = MagicMock()
+        db.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[{"id": self.AGENT_ID, "api_key_hash": hash_api_key(api_key)}]
+        )
+        return db
+
+    def test_repeat_check_skips_db(self):
+        from fastapi import HTTPException
+        from app.api.routes import _verify_agent_ownership
+        from app.services.agents import ownership_cache, invalidate_ownership_cache
+        ownership_cache.clear()
+        db = self._db("garl_owner")
+        with patch("app.api.routes._get_supabase", return_value=db):
+            _verify_agent_ownership(self.AGENT_ID, "garl_owner")
+            _verify_agent_ownership(self.AGENT_ID, "garl_owner")
+            assert db.table.call_count == 1
+
+            with pytest.raises(HTTPException) as exc_info:
+                _verify_agent_ownership(self.AGENT_ID, "garl_other")
+            assert exc_info.value.status_code == 403
+            assert db.table.call_count == 2
+
+            invalidate_ownership_cache(self.AGENT_ID)
+            _verify_agent_ownership(self.AGENT_ID, "garl_owner")
+            assert db.table.call_count == 3
+        ownership_cache.clear()
+
+
+class TestBadgeSvg:
+    """Badge SVG endpoint tests."""
+
+    AGENT_ID = "a1b2c3d4-e5f6-4789-a012-345678901234"
+
+    def test_agent_lookup_cached(self, client):
+        from app.api.routes import _badge_agent_cache
+        _badge_agent_cache.clear()
+        agent = {"name": "Badge Agent", "trust_score": 81.26, "certification_tier": "gold", "total_traces": 12}
+        with patch("app.api.routes.get_agent", return_value=agent) as get_agent:
+            first = client.get(f"/api/v1/badge/svg/{self.AGENT_ID}")
+            second = client.get(f"/api/v1/badge/svg/{self.AGENT_ID}")
+        assert first.status_code == 200
+        assert first.headers["content-type"] == "image/svg+xml"
+        assert b"GARL GOLD: 81.3" in first.content
+        assert "81.3 ✓".encode() in first.content
+        assert second.content == first.content
+        assert get_agent.call_count == 1
+        _badge_agent_cache.clear()
+
+    def test_unknown_agent_not_cached(self, client):
+        from app.api.routes import _badge_agent_cache
+        _badge_agent_cache.clear()
+        with patch("app.api.routes.get_agent", return_value=None) as get_agent:
+            assert client.get(f"/api/v1/badge/svg/{self.AGENT_ID}").status_code == 404
+            assert client.get(f"/api/v1/badge/svg/{self.AGENT_ID}").status_code == 404
+        assert get_agent.call_count == 2
+
+
+class TestBadgeWidget:
+    """Badge widget.js endpoint tests."""
+
+    def test_serves_js_with_etag(self, client):
+        resp = client.get("/api/v1/badge/widget.js")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/javascript")
+        assert resp.headers["etag"] == 'W/"widget-v1"'
+        assert b"data-agent-id" in resp.content
+
+    def test_matching_etag_returns_304(self, client):
+        resp = client.get("/api/v1/badge/widget.js", headers={"If-None-Match": 'W/"widget-v1"'})
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+
+class TestOpenClawIngest:
+    """OpenClaw webhook ingest tests."""
+
+    def test_tool_calls_projected(self, client):
+        with patch("app.api.routes.submit_trace", return_value={"id": "t1"}) as submit:
+            resp = client.post(
+                "/api/v1/ingest/openclaw",
+                json={
+                    "agent_id": "a1b2c3d4-e5f6-4789-a012-345678901234",
+                    "message": "fix the bug",
+                    "tool_calls": [
+                        {"name": "shell", "duration_ms": 12, "input": {"cmd": "ls"}},
+                        {"duration_ms": 3},
+                    ],
+                },
+                headers={"x-api-key": "garl_openclaw"},
+            )
+        assert resp.status_code == 200
+        trace_req = submit.call_args.args[0]
+        assert [(tc.name, tc.duration_ms, tc.input) for tc in trace_req.tool_calls] == [
+            ("shell", 12, None),
+            ("unknown", 3, None),
+        ]
+        assert trace_req.category.value == "coding"
+
+
+class TestPatchWebhook:
+    """Webhook PATCH tests."""
+
+    AGENT_ID = "a1b2c3d4-e5f6-4789-a012-345678901234"
+    WEBHOOK_ID = "b1b2c3d4-e5f6-4789-a012-345678901234"
+
+    def test_only_set_fields_forwarded(self, client):
+        with patch("app.api.routes._verify_agent_ownership"), \
+                patch("app.api.routes.update_webhook", return_value={"id": self.WEBHOOK_ID}) as update:
+            resp = client.patch(
+                f"/api/v1/webhooks/{self.AGENT_ID}/{self.WEBHOOK_ID}",
+                json={"is_active": False, "events": ["milestone"]},
+                headers={"x-api-key": "garl_hooks"},
+            )
+        assert resp.status_code == 200
+        assert update.call_args.args[2] == {"is_active": False, "events": ["milestone"]}
+
+    def test_crud_invalidates_cached_hooks(self, client):
+        headers = {"x-api-key": "garl_hooks"}
+        with patch("app.api.routes._verify_agent_ownership"), \
+                patch("app.api.routes.update_webhook", return_value={"id": self.WEBHOOK_ID}), \
+                patch("app.api.routes.delete_webhook", return_value=True), \
+                patch("app.api.routes.invalidate_hooks_cache") as invalidate:
+            client.patch(f"/api/v1/webhooks/{self.AGENT_ID}/{self.WEBHOOK_ID}", json={"is_active": False}, headers=headers)
+            client.delete(f"/api/v1/webhooks/{self.AGENT_ID}/{self.WEBHOOK_ID}", headers=headers)
+        assert [c.args[0] for c in invalidate.call_args_list] == [self.AGENT_ID, self.AGENT_ID]
+
+
+class TestLocalRateLimit:
+    """Process-local sliding window used when Redis is not configured."""
+
+    def test_buckets_limited_independently(self):
+        import asyncio
+        from app.core import ratelimit
+
+        async def run():
+            hits_a = [await ratelimit.hit("test:a", 2, 60) for _ in range(3)]
+            hits_b = [await ratelimit.hit("test:b", 2, 60) for _ in range(2)]
+            return hits_a, hits_b
+
+        ratelimit._local_store.pop("test:a", None)
+        ratelimit._local_store.pop("test:b", None)
+        hits_a, hits_b = asyncio.run(run())
+        assert hits_a[:2] == [None, None]
+        assert hits_a[2] is not None
+        assert hits_b == [None, None]
+
+    def test_stale_buckets_evicted_with_their_locks(self):
+        import asyncio
+        import time
+        from app.core import ratelimit
+
+        async def run():
+            await ratelimit.hit("test:stale", 5, 60)
+            ratelimit._local_store["test:stale"] = [time.time() - 600]
+            ratelimit._evict_stale(time.time())
+
+        asyncio.run(run())
+        assert "test:stale" not in ratelimit._local_store
+        assert "test:stale" not in ratelimit._bucket_locks
+
+    def test_redis_outage_skips_redis_until_retry(self):
+        import asyncio
+        from redis.exceptions import ConnectionError as RedisConnectionError
+        from app.core import ratelimit
+
+        script = AsyncMock(side_effect=RedisConnectionError("down"))
+        ratelimit._local_store.pop("test:outage", None)
+        with patch("app.core.ratelimit._get_redis_script", return_value=script), \
+                patch("app.core.ratelimit._redis_down_until", 0.0), \
+                patch("app.core.ratelimit.time") as clock:
+            clock.time.side_effect = [1000.0, 1001.0, 1011.0]
+            hits = [asyncio.run(ratelimit.hit("test:outage", 10, 60)) for _ in range(3)]
+        assert hits == [None, None, None]
+        assert script.await_count == 2
+        ratelimit._local_store.pop("test:outage", None)
+
+
+class TestTracePagination:
+    """Keyset pagination on agent traces."""
+
+    AGENT_ID = "a1b2c3d4-e5f6-4789-a012-345678901234"
+
+    def test_cursor_uses_created_at_filter(self, client):
+        db = MagicMock()
+        query = db.table.return_value.select.return_value.eq.return_value
+        query.lt.return_value.order.return_value.limit.return_value.execute.return_value = MagicMock(data=[{"id": "t1"}])
+        with patch("app.core.supabase_client.get_supabase", return_value=db):
+            resp = client.get(
+                f"/api/v1/agents/{self.AGENT_ID}/traces",
+                params={"cursor": "2025-01-15T12:00:00+00:00", "limit": 5},
+            )
+        assert resp.status_code == 200
+        assert resp.json() == [{"id": "t1"}]
+        query.lt.assert_called_once_with("created_at", "2025-01-15T12:00:00+00:00")
+        query.lt.return_value.order.return_value.limit.assert_called_once_with(5)
+        query.order.return_value.range.assert_not_called()
+
+    def test_invalid_cursor_rejected(self, client):
+        resp = client.get(f"/api/v1/agents/{self.AGENT_ID}/traces", params={"cursor": "yesterday"})
+        assert resp.status_code == 400
+
+
+class _FakeAgentsTable:
+    """In-memory stand-in for the agents leaderboard query chain."""
+
+    _KEYSET = re.compile(r"trust_score\.lt\.([^,]+),and\(trust_score\.eq\.([^,]+),id\.lt\.([^)]+)\)")
+
+    def __init__(self, rows):
+        self.rows = [dict(r) for r in rows]
+        self.filters = []
+        self.sort = []
+        self.window = None
+
+    def table(self, name):
+        assert name == "agents"
+        return _FakeAgentsTable(self.rows)
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda r: r.get(column, False) == value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda r: r[column] > value)
+        return self
+
+    def or_(self, expr):
+        lt_score, eq_score, lt_id = self._KEYSET.fullmatch(expr).groups()
+        self.filters.append(
+            lambda r: r["trust_score"] < float(lt_score)
+            or (r["trust_score"] == float(eq_score) and r["id"] < lt_id)
+        )
+        return self
+
+    def order(self, column, desc=False):
+        self.sort.append((column, desc))
+        return self
+
+    def limit(self, n):
+        self.window = (0, n)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end + 1 - start)
+        return self
+
+    def execute(self):
+        rows = [r for r in self.rows if all(f(r) for f in self.filters)]
+        for column, desc in reversed(self.sort):
+            rows.sort(key=lambda r: r[column], reverse=desc)
+        start, count = self.window
+        return MagicMock(data=[dict(r) for r in rows[start:start + count]])
+
+
+class TestLeaderboardPagination:
+    """Keyset pagination on the leaderboard."""
+
+    AGENT_ID = "a1b2c3d4-e5f6-4789-a012-345678901234"
+
+    def setup_method(self):
+        from app.api.routes import _leaderboard_cache
+        from app.core import ratelimit
+        _leaderboard_cache.clear()
+        for bucket in [k for k in ratelimit._local_store if k.startswith("export:")]:
+            del ratelimit._local_store[bucket]
+
+    def test_cursor_uses_keyset_filter(self, client):
+        db = MagicMock()
+        query = (
+            db.table.return_value.select.return_value.eq.return_value.eq.return_value
+            .gt.return_value.order.return_value.order.return_value
+        )
+        rows = [{"id": "b", "trust_score": 70.0, "total_traces": 3, "last_trace_at": None}]
+        query.or_.return_value.limit.return_value.execute.return_value = MagicMock(data=rows)
+        with patch("app.services.agents.get_supabase", return_value=db):
+            resp = client.get(
+                "/api/v1/leaderboard",
+                params={"cursor": f"50,72.5,{self.AGENT_ID}", "limit": 10},
+            )
+        assert resp.status_code == 200
+        assert resp.json()[0]["rank"] == 51
+        query.or_.assert_called_once_with(
+            f"trust_score.lt.72.5,and(trust_score.eq.72.5,id.lt.{self.AGENT_ID})"
+        )
+        query.or_.return_value.limit.assert_called_once_with(10)
+        query.range.assert_not_called()
+
+    def test_cursor_pages_past_idle_agents(self, client):
+        """Paging with the returned rank,trust_score,id must reach every ranked agent."""
+        from datetime import datetime, timedelta, timezone
+        now = datetime.now(timezone.utc)
+        scores = [90.0, 79.9, 79.8, 79.6, 79.5, 60.0]
+        rows = [
+            {
+                "id": f"00000000-0000-4000-8000-00000000000{i}",
+                "trust_score": score,
+                "total_traces": 5,
+                "is_deleted": False,
+                "is_sandbox": False,
+                "last_trace_at": (now - timedelta(days=60 if score == 79.9 else 0)).isoformat(),
+            }
+            for i, score in enumerate(scores)
+        ]
+        seen = []
+        params = {"limit": 2}
+        with patch("app.services.agents.get_supabase", return_value=_FakeAgentsTable(rows)):
+            while True:
+                page = client.get("/api/v1/leaderboard", params=params).json()
+                seen += page
+                if len(page) < 2:
+                    break
+                last = page[-1]
+                params["cursor"] = f"{last['rank']},{last['trust_score']},{last['id']}"
+        assert [e["trust_score"] for e in seen] == scores
+        assert [e["rank"] for e in seen] == [1, 2, 3, 4, 5, 6]
+
+    def test_pages_cached_per_query(self, client):
+        with patch("app.api.routes.get_leaderboard", return_value=[{"id": "a", "rank": 1}]) as lb:
+            client.get("/api/v1/leaderboard", params={"limit": 10})
+            client.get("/api/v1/leaderboard", params={"limit": 10})
+            client.get("/api/v1/leaderboard", params={"limit": 10, "category": "coding"})
+        assert lb.call_count == 2
+
+    def test_invalid_cursor_rejected(self, client):
+        for cursor in ("yesterday", f"1,nan,{self.AGENT_ID}", "1,50.0,not-a-uuid", f"-1,50.0,{self.AGENT_ID}"):
+            resp = client.get("/api/v1/leaderboard", params={"cursor": cursor})
+            assert resp.status_code == 400, cursor
+
+    def test_export_streams_every_page_as_ndjson(self, client):
+        import orjson
+        pages = [
+            [{"id": "c", "trust_score": 90.0, "rank": 1}, {"id": "b", "trust_score": 80.0, "rank": 2}],
+            [{"id": "a", "trust_score": 70.0, "rank": 3}],
+        ]
+        with patch("app.services.agents.get_leaderboard", side_effect=pages) as lb:
+            from app.services.agents import iter_leaderboard
+            with patch("app.api.routes.iter_leaderboard", lambda category: iter_leaderboard(category, page_size=2)):
+                resp = client.get("/api/v1/leaderboard/export")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        lines = resp.content.splitlines()
+        assert [orjson.loads(line)["id"] for line in lines] == ["c", "b", "a"]
+        assert lb.call_args_list[1].args == (None, 2, 0, (2, 80.0, "b"))
+
+    def test_export_includes_agents_behind_idle_rows(self, client):
+        import orjson
+        from datetime import datetime, timedelta, timezone
+        from app.services.agents import iter_leaderboard
+        stale = (datetime.now(timezone.utc) - timedelta(days=60)).isoformat()
+        scores = [95.0, 79.9, 79.7, 79.4, 50.0]
+        rows = [
+            {
+                "id": f"00000000-0000-4000-8000-00000000000{i}",
+                "trust_score": score,
+                "total_traces": 5,
+                "is_deleted": False,
+                "is_sandbox": False,
+                "last_trace_at": stale if score == 79.9 else None,
+            }
+            for i, score in enumerate(scores)
+        ]
+        with patch("app.services.agents.get_supabase", return_value=_FakeAgentsTable(rows)), \
+                patch("app.api.routes.iter_leaderboard", lambda category: iter_leaderboard(category, page_size=2)):
+            resp = client.get("/api/v1/leaderboard/export")
+        exported = [orjson.loads(line) for line in resp.content.splitlines()]
+        assert [e["trust_score"] for e in exported] == scores
+        assert [e["rank"] for e in exported] == [1, 2, 3, 4, 5]
+
+    def test_export_rate_limited(self, client):
+        from app.api.routes import RATE_LIMITS
+        limit, _ = RATE_LIMITS["export"]
+        with patch("app.api.routes.iter_leaderboard", return_value=iter(())) as export:
+            codes = [client.get("/api/v1/leaderboard/export").status_code for _ in range(limit + 1)]
+        assert codes == [200] * limit + [429]
+        assert export.call_count == limit
+
+
+class TestWellKnownAgentJson:
+    """/.well-known/agent.json discovery document tests."""
+
+    def test_leaderboard_read_cached(self, client):
+        from app.main import _agent_json_cache
+        _agent_json_cache.clear()
+        top = [{"id": "1", "name": "A", "trust_score": 70.12, "total_traces": 5, "framework": "x", "certification_tier": "gold"}]
+        with patch("app.main.get_leaderboard", return_value=top) as leaderboard:
+            first = client.get("/.well-known/agent.json")
+            second = client.get("/.well-known/agent.json")
+        assert first.status_code == 200
+        data = first.json()
+        assert data["skills"] == [{"id": "1", "name": "A", "description": "[GOLD] Trust: 70.1/100 | 5 traces | x"}]
+        assert data["trust"]["public_key"]
+        assert data["trust"]["algorithm"] == "ECDSA-secp256k1"
+        assert second.content == first.content
+        assert leaderboard.call_count == 1
+        _agent_json_cache.clear()
@@ -9,6 +9,7 @@ Adversarial testing across four attack surfaces:
 """
 import hashlib
 import json
+import secrets
 import copy
 import uuid
 import time
@@ -250,6 +251,22 @@ class TestImmutability:
             "Key order affects hash — canonical serialization broken"
         )
 
+    def test_trace_hash_fast_path_matches_json(self):
+        """The direct trace_raw encoding must hash the exact json.dumps bytes."""
+        from app.services.traces import _canonical_trace_bytes
+
+        base = {
+            "trace_id": str(uuid.uuid4()), "agent_id": str(uuid.uuid4()),
+            "status": "success", "duration_ms": 1234, "category": "coding",
+            "token_count": 0, "timestamp": "2026-01-01T00:00:00.123456+00:00",
+        }
+        for task, cost in [("Fix \"quoted\" path\\n\t", 0.0123), ("Résumé 😀 <b>&</b>\x7f", 0), ("x", 1e-07)]:
+            data = {**base, "task_description": task, "cost_usd": cost}
+            expected = json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+            assert _canonical_trace_bytes(data) == expected
+            assert _compute_trace_hash(data) == hashlib.sha256(expected).hexdigest()
+        assert _canonical_trace_bytes({**base, "task_description": "x", "cost_usd": float("inf")}) is None
+
     def test_anomaly_flags_capped_at_ten(self):
         """Anomaly flags array must never exceed 10 entries (memory safety)."""
         existing = [
@@ -537,6 +554,25 @@ class TestAnomalyResilience:
         active = [f for f in not_cleared if not f.get("archived")]
         assert len(active) == 1, "Warning cleared before 50 clean traces"
 
+    def test_a2a_trust_downgrades_on_active_anomaly_count(self):
+        """A2A trust must stop recommending an agent with active anomalies."""
+        from app.services.agents import get_a2a_trust
+
+        agent = {
+            "id": "a1b2c3d4-e5f6-4789-a012-345678901234", "name": "A",
+            "trust_score": 90.0, "success_rate": 99.0, "total_traces": 100,
+            "anomaly_flags": [{"type": "old", "archived": True}], "active_anomaly_count": 0,
+        }
+        mock_client = MagicMock()
+        query = mock_client.table.return_value.select.return_value.eq.return_value.eq.return_value
+        query.execute.return_value = MagicMock(data=[agent])
+        with patch("app.services.agents.get_supabase", return_value=mock_client):
+            assert get_a2a_trust(agent["id"])["recommendation"] == "trusted"
+            agent["active_anomaly_count"] = 1
+            result = get_a2a_trust(agent["id"])
+        assert result["risk_level"] == "medium"
+        assert result["recommendation"] == "proceed_with_monitoring"
+
 
 # ============================================================================
 # SECTION 6: TIME DECAY INTEGRITY
@@ -552,26 +588,92 @@ class TestTimeDecayIntegrity:
         drift = abs(decayed - score)
         assert drift < 0.05, f"Excessive decay within 24h: {score} -> {decayed} (drift={drift})"
 
-    def test_lazy_decay_guard_blocks_under_24h(self):
-        """_apply_lazy_decay wrapper must skip decay entirely for < 24h idle."""
-        from app.services.agents import _apply_lazy_decay
+    def test_leaderboard_serves_stored_scores(self):
+        """Leaderboard reads must not decay or write; the decay worker owns decay."""
+        from app.services.agents import get_leaderboard
+        from datetime import timedelta
+
+        stale = (datetime.now(timezone.utc) - timedelta(days=60)).isoformat()
+        rows = [{"id": "a", "trust_score": 90.0, "total_traces": 5, "last_trace_at": stale}]
+        mock_db = MagicMock()
+        query = (
+            mock_db.table.return_value.select.return_value.eq.return_value.eq.return_value
+            .gt.return_value.order.return_value.order.return_value
+        )
+        query.range.return_value.execute.return_value = MagicMock(data=rows)
+        with patch("app.services.agents.get_supabase", return_value=mock_db):
+            entries = get_leaderboard(limit=10)
+        assert entries == [{**rows[0], "rank": 1}]
+        assert entries[0]["trust_score"] == 90.0
+        mock_db.rpc.assert_not_called()
+
+    def test_decay_worker_passes_do_not_compound(self):
+        """Repeated worker passes must decay from the last decay, not the last trace."""
+        from app.services.agents import decay_stale_agents
         from datetime import timedelta
 
         now = datetime.now(timezone.utc)
-        agent = {
+        row = {
             "id": "test",
             "trust_score": 85.0,
-            "total_traces": 10,
-            "last_trace_at": (now - timedelta(hours=12)).isoformat(),
             "score_reliability": 85.0,
             "score_speed": 85.0,
             "score_cost_efficiency": 85.0,
             "score_consistency": 85.0,
             "score_security": 85.0,
+            "anomaly_flags": [],
+            "last_trace_at": (now - timedelta(days=30)).isoformat(),
+            # Already decayed by an earlier pass a minute ago.
+            "decayed_at": (now - timedelta(minutes=1)).isoformat(),
         }
         mock_db = MagicMock()
-        result = _apply_lazy_decay(agent, mock_db)
-        assert result["trust_score"] == 85.0, "Lazy decay triggered within 24h"
+        select = mock_db.table.return_value.select.return_value
+        select.eq.return_value.gt.return_value.lt.return_value.order.return_value \
+            .limit.return_value.execute.return_value.data = [row]
+        mock_db.rpc.return_value.execute.return_value.data = 1
+
+        with patch("app.services.agents.get_supabase", return_value=mock_db):
+            assert decay_stale_agents() == 0
+        mock_db.rpc.assert_not_called()
+
+        row["decayed_at"] = None
+        with patch("app.services.agents.get_supabase", return_value=mock_db), \
+                patch("app.services.agents.invalidate_agent_row") as invalidate_row:
+            assert decay_stale_agents() == 1
+        invalidate_row.assert_called_once_with("test")
+        fn, params = mock_db.rpc.call_args[0]
+        assert fn == "apply_agent_decay"
+        assert params["updates"][0]["id"] == "test"
+        updates = params["updates"][0]
+        assert updates["trust_score"] == pytest.approx(apply_time_decay(85.0, 30 * 24), abs=0.01)
+        assert updates["decayed_at"] == updates["updated_at"]
+        cutoff = datetime.fromisoformat(params["cutoff"])
+        assert abs(cutoff - (now - timedelta(hours=24))) < timedelta(minutes=1)
+
+    def test_decay_not_reset_by_profile_writes(self):
+        """A recent updated_at (endorsement, profile edit) must not cancel accrued decay."""
+        from app.services.agents import decay_stale_agents
+        from datetime import timedelta
+
+        now = datetime.now(timezone.utc)
+        row = {
+            "id": "test",
+            "trust_score": 85.0,
+            "anomaly_flags": [],
+            "last_trace_at": (now - timedelta(days=30)).isoformat(),
+            "decayed_at": None,
+            "updated_at": (now - timedelta(minutes=1)).isoformat(),
+        }
+        mock_db = MagicMock()
+        select = mock_db.table.return_value.select.return_value
+        select.eq.return_value.gt.return_value.lt.return_value.order.return_value \
+            .limit.return_value.execute.return_value.data = [row]
+        mock_db.rpc.return_value.execute.return_value.data = 1
+
+        with patch("app.services.agents.get_supabase", return_value=mock_db):
+            assert decay_stale_agents() == 1
+        updates = mock_db.rpc.call_args[0][1]["updates"][0]
+        assert updates["trust_score"] == pytest.approx(apply_time_decay(85.0, 30 * 24), abs=0.01)
 
     def test_decay_pulls_toward_baseline(self):
         """Decay must pull scores toward baseline (50), not toward zero."""
@@ -637,6 +739,24 @@ class TestAPIKeySecurity:
         assert len(stored_hash) == 64
         assert raw_key not in stored_hash
 
+    def test_api_key_check_is_constant_time(self):
+        """Key checks go through secrets.compare_digest, not ==."""
+        from app.services.agents import api_key_matches, hash_api_key
+
+        stored = hash_api_key("garl_abc123secretkey")
+        with patch("app.services.agents.secrets.compare_digest", wraps=secrets.compare_digest) as cmp:
+            assert api_key_matches("garl_abc123secretkey", stored)
+        cmp.assert_called_once()
+        assert not api_key_matches("garl_wrong", stored)
+        assert not api_key_matches("garl_abc123secretkey", None)
+
+    def test_api_keys_not_retained_in_memory(self):
+        """Hashing must not keep plaintext keys around in a memo cache."""
+        from app.services.agents import hash_api_key
+
+        assert not hasattr(hash_api_key, "cache_info")
+        assert hash_api_key("garl_k") == hashlib.sha256(b"garl_k").hexdigest()
+
 
 # ============================================================================
 # SECTION 8: INPUT VALIDATION & EDGE CASES
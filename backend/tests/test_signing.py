@@ -63,6 +63,15 @@ class TestVerifySignature:
         cert["proof"]["signature"] = "0" * 128  # Invalid signature
         assert verify_signature(cert) is False
 
+    def test_high_s_signature_accepted(self):
+        """High-S signatures (as issued by the old python-ecdsa signer) should still verify."""
+        n = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+        cert = sign_trace({"legacy": True})
+        sig = bytes.fromhex(cert["proof"]["signature"])
+        s = int.from_bytes(sig[32:], "big")
+        cert["proof"]["signature"] = (sig[:32] + (n - s).to_bytes(32, "big")).hex()
+        assert verify_signature(cert) is True
+
     def test_missing_proof_returns_false(self):
         """Should return False if proof is missing."""
         cert = {"payload": {"a": 1}, "proof": {}}
@@ -102,3 +111,20 @@ class TestGetSigningKey:
                 assert "SIGNING_PRIVATE_KEY_HEX" in str(exc_info.value)
             finally:
                 signing_mod._signing_key = original_key
+
+
+class TestCanonicalJson:
+    """_canonical_json must match the json.dumps form signatures were made over."""
+
+    @pytest.mark.parametrize("payload", [
+        {"b": 1, "a": [1.5, True, "x"]},
+        {"delta": 4.9e-05, "big": 1e16},
+        {"name": "ajan ✓", "ctrl": "\x7f\n"},
+        {"missing": None},
+        {"n": 2 ** 70},
+    ])
+    def test_matches_json_dumps(self, payload):
+        import json
+        from app.core.signing import _canonical_json
+        expected = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+        assert _canonical_json(payload) == expected
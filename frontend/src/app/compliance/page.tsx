@@ -261,11 +261,12 @@ function ComplianceContent() {
   const dims = data.dimensions;
   const anomalyHistory = data.anomaly_history || { active: [], archived: [], total_flags: 0 };
   const endorsement = data.endorsement_summary || {
-    received: [],
-    given: [],
+    received_count: 0,
+    given_count: 0,
     total_endorsement_bonus: 0,
+    recent_received: [],
   };
-  const recentEndorsements = (endorsement.received || []).slice(0, 5);
+  const recentEndorsements = endorsement.recent_received || [];
 
   const dimLabels: Record<string, string> = {
     reliability: "Reliability",
@@ -645,7 +646,7 @@ function ComplianceContent() {
                 Received
               </div>
               <div className="font-mono text-2xl font-bold text-garl-text">
-                {(endorsement.received || []).length}
+                {endorsement.received_count ?? 0}
               </div>
             </div>
             <div className="rounded-lg border border-garl-border bg-garl-bg/50 p-4">
@@ -653,7 +654,7 @@ function ComplianceContent() {
                 Given
               </div>
               <div className="font-mono text-2xl font-bold text-garl-text">
-                {(endorsement.given || []).length}
+                {endorsement.given_count ?? 0}
               </div>
             </div>
           </div>
@@ -463,6 +463,7 @@ curl -X POST https://api.garl.ai/api/v1/verify/check \\
               { method: "POST", path: "/api/v1/verify/check", desc: "Verify an ECDSA certificate's authenticity" },
               { method: "GET", path: "/api/v1/trust/verify", desc: "A2A trust check: risk level, recommendation, dimensions (?agent_id=)" },
               { method: "GET", path: "/api/v1/leaderboard", desc: "Ranked agents (?category=&limit=&offset=)" },
+              { method: "GET", path: "/api/v1/leaderboard/export", desc: "Full leaderboard as NDJSON, streamed (?category=)" },
               { method: "GET", path: "/api/v1/feed", desc: "Recent trace activity feed (?limit=)" },
               { method: "GET", path: "/api/v1/stats", desc: "Protocol stats: total agents, traces, top agent" },
               { method: "GET", path: "/api/v1/agents/:id/history", desc: "Trust score history over time (?limit=)" },
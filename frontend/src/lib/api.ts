@@ -132,21 +132,17 @@ export interface ComplianceReport {
   };
   security_risks?: Array<{ level: "critical" | "warning" | "info"; message: string; details?: unknown }>;
   endorsement_summary?: {
-    received: Array<{
+    received_count: number;
+    given_count: number;
+    total_endorsement_bonus: number;
+    recent_received: Array<{
+      id?: string;
       endorser_id?: string;
       endorser_tier?: string;
       bonus_applied?: number;
       context?: string;
       created_at?: string;
     }>;
-    given: Array<{
-      target_id?: string;
-      endorser_tier?: string;
-      bonus_applied?: number;
-      context?: string;
-      created_at?: string;
-    }>;
-    total_endorsement_bonus?: number;
   };
   permissions_declared?: string[];
   created_at?: string;
@@ -0,0 +1,5 @@
+-- GARL Protocol v1.0.1 — Keyset pagination for agent traces
+-- /agents/{id}/traces pages with created_at < cursor; this index serves the
+-- agent_id filter and the created_at order in one scan.
+
+CREATE INDEX IF NOT EXISTS idx_traces_agent_created ON traces(agent_id, created_at DESC);
@@ -0,0 +1,33 @@
+-- GARL Protocol v1.0.1 — Batched score decay
+-- One UPDATE for a page of decayed agents (leaderboard and decay worker).
+-- Columns a row omits keep their current value.
+
+CREATE OR REPLACE FUNCTION apply_agent_decay(updates JSONB) RETURNS INTEGER AS $$
+    WITH u AS (
+        SELECT * FROM jsonb_to_recordset(updates) AS x(
+            id UUID,
+            trust_score NUMERIC,
+            score_reliability NUMERIC,
+            score_speed NUMERIC,
+            score_cost_efficiency NUMERIC,
+            score_consistency NUMERIC,
+            score_security NUMERIC,
+            certification_tier VARCHAR(20),
+            updated_at TIMESTAMPTZ
+        )
+    ), done AS (
+        UPDATE agents a SET
+            trust_score = COALESCE(u.trust_score, a.trust_score),
+            score_reliability = COALESCE(u.score_reliability, a.score_reliability),
+            score_speed = COALESCE(u.score_speed, a.score_speed),
+            score_cost_efficiency = COALESCE(u.score_cost_efficiency, a.score_cost_efficiency),
+            score_consistency = COALESCE(u.score_consistency, a.score_consistency),
+            score_security = COALESCE(u.score_security, a.score_security),
+            certification_tier = COALESCE(u.certification_tier, a.certification_tier),
+            updated_at = COALESCE(u.updated_at, a.updated_at)
+        FROM u
+        WHERE a.id = u.id
+        RETURNING 1
+    )
+    SELECT count(*)::INTEGER FROM done;
+$$ LANGUAGE sql;
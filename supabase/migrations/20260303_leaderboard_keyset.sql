@@ -0,0 +1,6 @@
+-- GARL Protocol v1.0.1 — Keyset pagination for the leaderboard
+-- /leaderboard pages on (trust_score DESC, id DESC) after a cursor; the
+-- partial index matches the public leaderboard filter.
+
+CREATE INDEX IF NOT EXISTS idx_agents_leaderboard_keyset ON agents(trust_score DESC, id DESC)
+    WHERE is_deleted = false AND is_sandbox = false AND total_traces > 0;
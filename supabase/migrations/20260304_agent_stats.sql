@@ -0,0 +1,17 @@
+-- GARL Protocol v1.0.1 — Dashboard stats in one call
+-- get_stats() reads both counts and the top agent from one snapshot.
+
+CREATE OR REPLACE FUNCTION get_agent_stats() RETURNS JSON AS $$
+    SELECT json_build_object(
+        'total_agents', (SELECT count(*) FROM agents WHERE is_deleted = false AND is_sandbox = false),
+        'total_traces', (SELECT count(*) FROM traces),
+        'top_agent', (
+            SELECT row_to_json(t) FROM (
+                SELECT name, trust_score, certification_tier FROM agents
+                WHERE is_deleted = false AND is_sandbox = false AND total_traces > 0
+                ORDER BY trust_score DESC
+                LIMIT 1
+            ) t
+        )
+    );
+$$ LANGUAGE sql STABLE;
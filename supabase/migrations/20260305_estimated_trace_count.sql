@@ -0,0 +1,24 @@
+-- GARL Protocol v1.0.1 — Estimated trace count for dashboard stats
+-- total_traces switches to pg_class.reltuples past 100k rows, so /stats
+-- no longer scans the whole traces table. total_agents stays exact.
+
+CREATE OR REPLACE FUNCTION get_agent_stats() RETURNS JSON AS $$
+    SELECT json_build_object(
+        'total_agents', (SELECT count(*) FROM agents WHERE is_deleted = false AND is_sandbox = false),
+        -- Planner estimate once traces is large (O(1) instead of a full
+        -- scan); exact while small, where reltuples can be stale or -1.
+        'total_traces', (
+            SELECT CASE WHEN c.reltuples >= 100000 THEN c.reltuples::BIGINT
+                        ELSE (SELECT count(*) FROM traces) END
+            FROM pg_class c WHERE c.oid = 'public.traces'::regclass
+        ),
+        'top_agent', (
+            SELECT row_to_json(t) FROM (
+                SELECT name, trust_score, certification_tier FROM agents
+                WHERE is_deleted = false AND is_sandbox = false AND total_traces > 0
+                ORDER BY trust_score DESC
+                LIMIT 1
+            ) t
+        )
+    );
+$$ LANGUAGE sql STABLE;
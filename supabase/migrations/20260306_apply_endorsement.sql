@@ -0,0 +1,49 @@
+-- GARL Protocol v1.0.1 — Atomic endorsements
+-- Inserts the endorsement and applies the bonus to the locked target row in
+-- one transaction, so concurrent endorsements cannot lose updates.
+
+CREATE OR REPLACE FUNCTION apply_endorsement(endorsement JSONB) RETURNS JSON AS $$
+DECLARE
+    e endorsements%ROWTYPE := jsonb_populate_record(NULL::endorsements, endorsement);
+    t agents%ROWTYPE;
+    new_trust NUMERIC;
+    new_tier VARCHAR(20);
+BEGIN
+    -- Row lock: concurrent endorsements of one target apply one at a time.
+    SELECT * INTO t FROM agents WHERE id = e.target_id AND is_deleted = false FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Target agent not found' USING ERRCODE = 'P0002';
+    END IF;
+
+    -- UNIQUE(endorser_id, target_id) rejects duplicates with 23505.
+    INSERT INTO endorsements (
+        id, endorser_id, target_id, endorser_score, endorser_traces,
+        bonus_applied, endorser_tier, tier_multiplier, context, created_at
+    ) VALUES (
+        e.id, e.endorser_id, e.target_id, e.endorser_score, e.endorser_traces,
+        e.bonus_applied, e.endorser_tier, e.tier_multiplier, e.context, e.created_at
+    );
+
+    -- Mirrors clamp_score() and compute_certification_tier().
+    new_trust := LEAST(100, GREATEST(0, ROUND(COALESCE(t.trust_score, 50) + e.bonus_applied, 2)));
+    new_tier := CASE
+        WHEN new_trust >= 90 AND NOT EXISTS (
+            SELECT 1 FROM jsonb_array_elements(COALESCE(t.anomaly_flags, '[]')) f
+            WHERE COALESCE((f->>'archived')::BOOLEAN, false) = false
+        ) THEN 'enterprise'
+        WHEN new_trust >= 70 THEN 'gold'
+        WHEN new_trust >= 40 THEN 'silver'
+        ELSE 'bronze'
+    END;
+
+    UPDATE agents SET
+        endorsement_score = ROUND(COALESCE(t.endorsement_score, 0) + e.bonus_applied, 4),
+        endorsement_count = COALESCE(t.endorsement_count, 0) + 1,
+        trust_score = new_trust,
+        certification_tier = new_tier,
+        updated_at = e.created_at
+    WHERE id = t.id;
+
+    RETURN json_build_object('trust_score', new_trust, 'certification_tier', new_tier);
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,7 @@
+-- GARL Protocol v1.0.1 — Endorsement bonus total
+-- get_endorsements() reads the received bonus as one aggregate instead of
+-- summing every received row in Python.
+
+CREATE OR REPLACE FUNCTION endorsement_bonus_total(aid UUID) RETURNS NUMERIC AS $$
+    SELECT COALESCE(SUM(bonus_applied), 0) FROM endorsements WHERE target_id = aid;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,8 @@
+-- GARL Protocol v1.0.1 — Index for /route
+-- route_agents filters on category and a set of tiers, then orders by
+-- trust_score DESC with a small LIMIT. idx_agents_route puts the tier
+-- before trust_score, so an IN over several tiers still needs a sort; this
+-- partial index walks one category in trust order and stops at LIMIT.
+
+CREATE INDEX IF NOT EXISTS idx_agents_route_trust ON agents(category, trust_score DESC)
+    WHERE is_deleted = false AND total_traces > 0;
@@ -0,0 +1,13 @@
+-- GARL Protocol v1.0.1 — Endorsement summary for compliance reports
+-- Counts and received bonus in one aggregate instead of inlining every
+-- endorsement row into each report.
+
+CREATE OR REPLACE FUNCTION get_endorsement_summary(aid UUID) RETURNS JSON AS $$
+    SELECT json_build_object(
+        'received_count', count(*) FILTER (WHERE target_id = aid),
+        'given_count', count(*) FILTER (WHERE endorser_id = aid),
+        'total_bonus', COALESCE(sum(bonus_applied) FILTER (WHERE target_id = aid), 0)
+    )
+    FROM endorsements
+    WHERE target_id = aid OR endorser_id = aid;
+$$ LANGUAGE sql STABLE;
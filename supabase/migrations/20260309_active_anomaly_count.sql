@@ -0,0 +1,7 @@
+-- GARL Protocol v1.0.1 — Active anomaly count
+-- Postgres keeps the number of unarchived anomaly_flags entries in step
+-- with every write, so trust checks read one integer instead of the flags.
+
+ALTER TABLE agents ADD COLUMN IF NOT EXISTS active_anomaly_count INTEGER GENERATED ALWAYS AS (
+    jsonb_array_length(jsonb_path_query_array(COALESCE(anomaly_flags, '[]'::jsonb), '$[*] ? (!(@.archived == true))'))
+) STORED;
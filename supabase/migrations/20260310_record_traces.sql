@@ -0,0 +1,53 @@
+-- GARL Protocol v1.0.1 — Record traces in one transaction
+-- submit_trace()/submit_traces_bulk() write the trace rows, the agent's new
+-- scores and the reputation history rows in one round-trip; either all of
+-- them land or none do. Rows are built in Python and carry every column.
+-- The agent row is only updated while it is not deleted, and the row as
+-- committed is returned so the caller caches what Postgres holds.
+
+DROP FUNCTION IF EXISTS record_traces(UUID, JSONB, JSONB, JSONB);
+
+CREATE OR REPLACE FUNCTION record_traces(
+    target_id UUID, trace_rows JSONB, agent_update JSONB, history_rows JSONB
+) RETURNS agents AS $$
+DECLARE
+    updated agents;
+BEGIN
+    UPDATE agents a SET
+        trust_score = u.trust_score,
+        total_traces = u.total_traces,
+        success_count = u.success_count,
+        success_rate = u.success_rate,
+        consecutive_successes = u.consecutive_successes,
+        total_cost_usd = u.total_cost_usd,
+        avg_duration_ms = u.avg_duration_ms,
+        score_reliability = u.score_reliability,
+        score_security = u.score_security,
+        score_speed = u.score_speed,
+        score_cost_efficiency = u.score_cost_efficiency,
+        score_consistency = u.score_consistency,
+        ema_reliability = u.ema_reliability,
+        ema_security = u.ema_security,
+        ema_speed = u.ema_speed,
+        ema_cost_efficiency = u.ema_cost_efficiency,
+        anomaly_flags = u.anomaly_flags,
+        certification_tier = u.certification_tier,
+        last_trace_at = u.last_trace_at,
+        updated_at = u.updated_at
+    FROM jsonb_populate_record(NULL::agents, agent_update) u
+    WHERE a.id = target_id AND a.is_deleted IS NOT TRUE
+    RETURNING a.* INTO updated;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Agent not found or deactivated' USING ERRCODE = 'P0002';
+    END IF;
+
+    INSERT INTO traces
+    SELECT * FROM jsonb_populate_recordset(NULL::traces, trace_rows);
+
+    INSERT INTO reputation_history
+    SELECT * FROM jsonb_populate_recordset(NULL::reputation_history, history_rows);
+
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,48 @@
+-- GARL Protocol v1.0.1 — Decay bookkeeping
+-- decayed_at records when time decay was last applied, so the decay worker
+-- measures idle time from max(last_trace_at, decayed_at) instead of
+-- updated_at, which endorsements and profile edits also move.
+-- apply_agent_decay only touches rows that are still idle at cutoff, so a
+-- batch computed from an earlier read never overwrites scores a concurrent
+-- record_traces has just committed.
+
+ALTER TABLE agents ADD COLUMN IF NOT EXISTS decayed_at TIMESTAMPTZ;
+
+-- Idle agents have been kept decayed by the worker, which last stamped updated_at.
+UPDATE agents SET decayed_at = updated_at
+WHERE decayed_at IS NULL AND total_traces > 0 AND updated_at > last_trace_at
+  AND last_trace_at < NOW() - INTERVAL '24 hours';
+
+DROP FUNCTION IF EXISTS apply_agent_decay(JSONB);
+
+CREATE OR REPLACE FUNCTION apply_agent_decay(updates JSONB, cutoff TIMESTAMPTZ) RETURNS INTEGER AS $$
+    WITH u AS (
+        SELECT * FROM jsonb_to_recordset(updates) AS x(
+            id UUID,
+            trust_score NUMERIC,
+            score_reliability NUMERIC,
+            score_speed NUMERIC,
+            score_cost_efficiency NUMERIC,
+            score_consistency NUMERIC,
+            score_security NUMERIC,
+            certification_tier VARCHAR(20),
+            decayed_at TIMESTAMPTZ,
+            updated_at TIMESTAMPTZ
+        )
+    ), done AS (
+        UPDATE agents a SET
+            trust_score = COALESCE(u.trust_score, a.trust_score),
+            score_reliability = COALESCE(u.score_reliability, a.score_reliability),
+            score_speed = COALESCE(u.score_speed, a.score_speed),
+            score_cost_efficiency = COALESCE(u.score_cost_efficiency, a.score_cost_efficiency),
+            score_consistency = COALESCE(u.score_consistency, a.score_consistency),
+            score_security = COALESCE(u.score_security, a.score_security),
+            certification_tier = COALESCE(u.certification_tier, a.certification_tier),
+            decayed_at = COALESCE(u.decayed_at, a.decayed_at),
+            updated_at = COALESCE(u.updated_at, a.updated_at)
+        FROM u
+        WHERE a.id = u.id AND a.last_trace_at < cutoff
+        RETURNING 1
+    )
+    SELECT count(*)::INTEGER FROM done;
+$$ LANGUAGE sql;
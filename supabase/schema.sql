@@ -26,6 +26,9 @@ CREATE TABLE IF NOT EXISTS agents (
     total_cost_usd NUMERIC(12,6) DEFAULT 0,
     avg_duration_ms INTEGER DEFAULT 0,
     anomaly_flags JSONB DEFAULT '[]',
+    active_anomaly_count INTEGER GENERATED ALWAYS AS (
+        jsonb_array_length(jsonb_path_query_array(COALESCE(anomaly_flags, '[]'::jsonb), '$[*] ? (!(@.archived == true))'))
+    ) STORED,
     endorsement_score NUMERIC(8,4) DEFAULT 0.0,
     endorsement_count INTEGER DEFAULT 0,
     sovereign_id TEXT UNIQUE NOT NULL,
@@ -36,6 +39,7 @@ CREATE TABLE IF NOT EXISTS agents (
     is_sandbox BOOLEAN NOT NULL DEFAULT false,
     deleted_at TIMESTAMPTZ,
     last_trace_at TIMESTAMPTZ,
+    decayed_at TIMESTAMPTZ,
     homepage_url TEXT,
     api_key_hash VARCHAR(255) NOT NULL,
     developer_id UUID,
@@ -112,8 +116,10 @@ CREATE TABLE IF NOT EXISTS endorsements (
 -- Indexes
 CREATE INDEX IF NOT EXISTS idx_traces_agent_id ON traces(agent_id);
 CREATE INDEX IF NOT EXISTS idx_traces_created_at ON traces(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_traces_agent_created ON traces(agent_id, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_traces_status ON traces(status);
 CREATE INDEX IF NOT EXISTS idx_agents_trust_score ON agents(trust_score DESC);
+CREATE INDEX IF NOT EXISTS idx_agents_leaderboard_keyset ON agents(trust_score DESC, id DESC) WHERE is_deleted = false AND is_sandbox = false AND total_traces > 0;
 CREATE INDEX IF NOT EXISTS idx_agents_category ON agents(category);
 CREATE INDEX IF NOT EXISTS idx_agents_last_trace_at ON agents(last_trace_at DESC);
 CREATE INDEX IF NOT EXISTS idx_agents_sovereign_id ON agents(sovereign_id);
@@ -122,6 +128,7 @@ CREATE INDEX IF NOT EXISTS idx_agents_is_deleted ON agents(is_deleted);
 CREATE INDEX IF NOT EXISTS idx_agents_is_sandbox ON agents(is_sandbox) WHERE is_sandbox = true;
 CREATE INDEX IF NOT EXISTS idx_agents_score_security ON agents(score_security DESC);
 CREATE INDEX IF NOT EXISTS idx_agents_route ON agents(category, certification_tier, trust_score DESC) WHERE is_deleted = false;
+CREATE INDEX IF NOT EXISTS idx_agents_route_trust ON agents(category, trust_score DESC) WHERE is_deleted = false AND total_traces > 0;
 CREATE INDEX IF NOT EXISTS idx_reputation_history_agent ON reputation_history(agent_id, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_endorsements_target ON endorsements(target_id);
 CREATE INDEX IF NOT EXISTS idx_endorsements_endorser ON endorsements(endorser_id);
@@ -142,6 +149,171 @@ CREATE TRIGGER prevent_history_update BEFORE UPDATE ON reputation_history FOR EA
 CREATE TRIGGER prevent_history_delete BEFORE DELETE ON reputation_history FOR EACH ROW EXECUTE FUNCTION prevent_delete();
 CREATE TRIGGER prevent_endorsement_update BEFORE UPDATE ON endorsements FOR EACH ROW EXECUTE FUNCTION prevent_update();
 
+-- Batched score decay (columns a row omits keep their value; rows that
+-- traced since cutoff are left alone)
+CREATE OR REPLACE FUNCTION apply_agent_decay(updates JSONB, cutoff TIMESTAMPTZ) RETURNS INTEGER AS $$
+    WITH u AS (
+        SELECT * FROM jsonb_to_recordset(updates) AS x(
+            id UUID,
+            trust_score NUMERIC,
+            score_reliability NUMERIC,
+            score_speed NUMERIC,
+            score_cost_efficiency NUMERIC,
+            score_consistency NUMERIC,
+            score_security NUMERIC,
+            certification_tier VARCHAR(20),
+            decayed_at TIMESTAMPTZ,
+            updated_at TIMESTAMPTZ
+        )
+    ), done AS (
+        UPDATE agents a SET
+            trust_score = COALESCE(u.trust_score, a.trust_score),
+            score_reliability = COALESCE(u.score_reliability, a.score_reliability),
+            score_speed = COALESCE(u.score_speed, a.score_speed),
+            score_cost_efficiency = COALESCE(u.score_cost_efficiency, a.score_cost_efficiency),
+            score_consistency = COALESCE(u.score_consistency, a.score_consistency),
+            score_security = COALESCE(u.score_security, a.score_security),
+            certification_tier = COALESCE(u.certification_tier, a.certification_tier),
+            decayed_at = COALESCE(u.decayed_at, a.decayed_at),
+            updated_at = COALESCE(u.updated_at, a.updated_at)
+        FROM u
+        WHERE a.id = u.id AND a.last_trace_at < cutoff
+        RETURNING 1
+    )
+    SELECT count(*)::INTEGER FROM done;
+$$ LANGUAGE sql;
+
+-- Dashboard stats (counts + top agent) in one round-trip
+CREATE OR REPLACE FUNCTION get_agent_stats() RETURNS JSON AS $$
+    SELECT json_build_object(
+        'total_agents', (SELECT count(*) FROM agents WHERE is_deleted = false AND is_sandbox = false),
+        -- Planner estimate once traces is large (O(1) instead of a full
+        -- scan); exact while small, where reltuples can be stale or -1.
+        'total_traces', (
+            SELECT CASE WHEN c.reltuples >= 100000 THEN c.reltuples::BIGINT
+                        ELSE (SELECT count(*) FROM traces) END
+            FROM pg_class c WHERE c.oid = 'public.traces'::regclass
+        ),
+        'top_agent', (
+            SELECT row_to_json(t) FROM (
+                SELECT name, trust_score, certification_tier FROM agents
+                WHERE is_deleted = false AND is_sandbox = false AND total_traces > 0
+                ORDER BY trust_score DESC
+                LIMIT 1
+            ) t
+        )
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Atomic endorsement: insert + locked target score update
+CREATE OR REPLACE FUNCTION apply_endorsement(endorsement JSONB) RETURNS JSON AS $$
+DECLARE
+    e endorsements%ROWTYPE := jsonb_populate_record(NULL::endorsements, endorsement);
+    t agents%ROWTYPE;
+    new_trust NUMERIC;
+    new_tier VARCHAR(20);
+BEGIN
+    -- Row lock: concurrent endorsements of one target apply one at a time.
+    SELECT * INTO t FROM agents WHERE id = e.target_id AND is_deleted = false FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Target agent not found' USING ERRCODE = 'P0002';
+    END IF;
+
+    -- UNIQUE(endorser_id, target_id) rejects duplicates with 23505.
+    INSERT INTO endorsements (
+        id, endorser_id, target_id, endorser_score, endorser_traces,
+        bonus_applied, endorser_tier, tier_multiplier, context, created_at
+    ) VALUES (
+        e.id, e.endorser_id, e.target_id, e.endorser_score, e.endorser_traces,
+        e.bonus_applied, e.endorser_tier, e.tier_multiplier, e.context, e.created_at
+    );
+
+    -- Mirrors clamp_score() and compute_certification_tier().
+    new_trust := LEAST(100, GREATEST(0, ROUND(COALESCE(t.trust_score, 50) + e.bonus_applied, 2)));
+    new_tier := CASE
+        WHEN new_trust >= 90 AND NOT EXISTS (
+            SELECT 1 FROM jsonb_array_elements(COALESCE(t.anomaly_flags, '[]')) f
+            WHERE COALESCE((f->>'archived')::BOOLEAN, false) = false
+        ) THEN 'enterprise'
+        WHEN new_trust >= 70 THEN 'gold'
+        WHEN new_trust >= 40 THEN 'silver'
+        ELSE 'bronze'
+    END;
+
+    UPDATE agents SET
+        endorsement_score = ROUND(COALESCE(t.endorsement_score, 0) + e.bonus_applied, 4),
+        endorsement_count = COALESCE(t.endorsement_count, 0) + 1,
+        trust_score = new_trust,
+        certification_tier = new_tier,
+        updated_at = e.created_at
+    WHERE id = t.id;
+
+    RETURN json_build_object('trust_score', new_trust, 'certification_tier', new_tier);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Endorsement bonus total (received)
+CREATE OR REPLACE FUNCTION endorsement_bonus_total(aid UUID) RETURNS NUMERIC AS $$
+    SELECT COALESCE(SUM(bonus_applied), 0) FROM endorsements WHERE target_id = aid;
+$$ LANGUAGE sql STABLE;
+
+-- Endorsement summary (compliance report)
+CREATE OR REPLACE FUNCTION get_endorsement_summary(aid UUID) RETURNS JSON AS $$
+    SELECT json_build_object(
+        'received_count', count(*) FILTER (WHERE target_id = aid),
+        'given_count', count(*) FILTER (WHERE endorser_id = aid),
+        'total_bonus', COALESCE(sum(bonus_applied) FILTER (WHERE target_id = aid), 0)
+    )
+    FROM endorsements
+    WHERE target_id = aid OR endorser_id = aid;
+$$ LANGUAGE sql STABLE;
+
+-- Trace + agent + history writes in one transaction; returns the updated agent row
+CREATE OR REPLACE FUNCTION record_traces(
+    target_id UUID, trace_rows JSONB, agent_update JSONB, history_rows JSONB
+) RETURNS agents AS $$
+DECLARE
+    updated agents;
+BEGIN
+    UPDATE agents a SET
+        trust_score = u.trust_score,
+        total_traces = u.total_traces,
+        success_count = u.success_count,
+        success_rate = u.success_rate,
+        consecutive_successes = u.consecutive_successes,
+        total_cost_usd = u.total_cost_usd,
+        avg_duration_ms = u.avg_duration_ms,
+        score_reliability = u.score_reliability,
+        score_security = u.score_security,
+        score_speed = u.score_speed,
+        score_cost_efficiency = u.score_cost_efficiency,
+        score_consistency = u.score_consistency,
+        ema_reliability = u.ema_reliability,
+        ema_security = u.ema_security,
+        ema_speed = u.ema_speed,
+        ema_cost_efficiency = u.ema_cost_efficiency,
+        anomaly_flags = u.anomaly_flags,
+        certification_tier = u.certification_tier,
+        last_trace_at = u.last_trace_at,
+        updated_at = u.updated_at
+    FROM jsonb_populate_record(NULL::agents, agent_update) u
+    WHERE a.id = target_id AND a.is_deleted IS NOT TRUE
+    RETURNING a.* INTO updated;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Agent not found or deactivated' USING ERRCODE = 'P0002';
+    END IF;
+
+    INSERT INTO traces
+    SELECT * FROM jsonb_populate_recordset(NULL::traces, trace_rows);
+
+    INSERT INTO reputation_history
+    SELECT * FROM jsonb_populate_recordset(NULL::reputation_history, history_rows);
+
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
 -- RLS
 ALTER TABLE agents ENABLE ROW LEVEL SECURITY;
 ALTER TABLE traces ENABLE ROW LEVEL SECURITY;